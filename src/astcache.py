@@ -0,0 +1,140 @@
+import hashlib, marshal, os
+
+import metrics
+
+from htmlnode import LeafNode, ParentNode
+from pages import ParseState
+from transformers import parse_page
+
+# Bump when the parser or renderers change what they produce for the same
+# markdown, so stale trees are never loaded.
+PARSER_VERSION = 3
+
+LEAF = 0
+PARENT = 1
+
+# Nodes are numbered in pre-order on both sides, so the link props recorded in
+# ParseState.links can be stored as (node number, key, url).
+def node_to_data(node, nodes):
+    nodes.append(node)
+    if type(node) is LeafNode:
+        return (LEAF, node.tag, node.value, node.props)
+    if type(node) is ParentNode:
+        return (PARENT, node.tag, node.props, tuple(node_to_data(child, nodes) for child in node.children))
+    raise TypeError(f"Cannot serialize node type: '{type(node).__name__}'")
+
+def data_to_node(data, nodes):
+    if data[0] == LEAF:
+        node = LeafNode(data[1], data[2], data[3])
+        nodes.append(node)
+        return node
+    index = len(nodes)
+    nodes.append(None)
+    node = ParentNode(data[1], [data_to_node(child, nodes) for child in data[3]], data[2])
+    nodes[index] = node
+    return node
+
+def dumps(root_node, state):
+    nodes = []
+    tree = node_to_data(root_node, nodes)
+    numbers = {id(node.props): number for number, node in enumerate(nodes) if node.props}
+    links = []
+    for props, key, url in state.links:
+        number = numbers.get(id(props))
+        if number is None:
+            raise ValueError(f"Link '{url}' is not part of the tree")
+        links.append((number, key, url))
+    meta = (
+        state.title,
+        state.description,
+        state.word_count,
+        state.first_image,
+        tuple(state.headings.headings),
+        state.base_path,
+        tuple(links),
+        tuple(sorted(state.selectors)),
+    )
+    return marshal.dumps((PARSER_VERSION, tree, meta))
+
+def loads(data):
+    version, tree, meta = marshal.loads(data)
+    if version != PARSER_VERSION:
+        raise ValueError(f"AST cache version mismatch: {version} != {PARSER_VERSION}")
+    title, description, word_count, first_image, headings, base_path, links, selectors = meta
+    state = ParseState(base_path=base_path)
+    state.title = title
+    state.description = description
+    state.word_count = word_count
+    state.first_image = first_image
+    state.selectors = set(selectors)
+    for heading in headings:
+        state.headings.headings.append(heading)
+        state.headings.used.add(heading[2])
+    nodes = []
+    root_node = data_to_node(tree, nodes)
+    state.links = [(nodes[number].props, key, url) for number, key, url in links]
+    return root_node, state
+
+class ASTCache():
+    # Parsed trees stored as marshal blobs under cache_dir, keyed by the sha1 of
+    # the markdown source, so only changed documents are ever re-parsed. A
+    # long-lived process can also keep up to memory_size trees in memory.
+    def __init__(self, cache_dir, memory_size=0):
+        self.cache_dir = cache_dir
+        self.memory_size = memory_size
+        self.trees = {}
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, markdown):
+        digest = hashlib.sha1(markdown.encode()).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.bin")
+
+    def load(self, markdown):
+        path = self.path(markdown)
+        cached = self.trees.get(path)
+        if cached is not None:
+            return cached
+        try:
+            with open(path, "rb") as f:
+                cached = loads(f.read())
+        except (OSError, ValueError, EOFError, TypeError):
+            return None
+        self.remember(path, cached)
+        return cached
+
+    def remember(self, path, cached):
+        if self.memory_size <= 0:
+            return
+        if len(self.trees) >= self.memory_size:
+            self.trees.pop(next(iter(self.trees)))
+        self.trees[path] = cached
+
+    def store(self, markdown, root_node, state):
+        try:
+            data = dumps(root_node, state)
+        except (TypeError, ValueError):
+            return False
+        path = self.path(markdown)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self.remember(path, (root_node, state))
+        return True
+
+    def parse_page(self, markdown, base_path="/"):
+        cached = self.load(markdown)
+        if cached is not None:
+            self.hits += 1
+            if metrics.active is not None:
+                metrics.active.counter("ssg_ast_cache_hits_total").inc()
+            cached[1].apply_base_path(base_path)
+            return cached
+        self.misses += 1
+        if metrics.active is not None:
+            metrics.active.counter("ssg_ast_cache_misses_total").inc()
+        root_node, state = parse_page(markdown, base_path=base_path)
+        self.store(markdown, root_node, state)
+        return root_node, state
@@ -0,0 +1,30 @@
+import os, timeit
+
+from astcache import dumps, loads
+from transformers import parse_page
+
+CONTENT_DIR = "./content"
+REPEAT = 50
+
+def load_pages():
+    pages = []
+    for dir_path, _, file_names in os.walk(CONTENT_DIR):
+        for file_name in file_names:
+            if file_name.endswith(".md"):
+                with open(os.path.join(dir_path, file_name)) as f:
+                    pages.append(f.read())
+    return pages
+
+def main():
+    pages = load_pages()
+    pages.append("\n\n".join(pages) * 10)
+    print(f"Parse vs cached load, {REPEAT} runs")
+    for markdown in pages:
+        blob = dumps(*parse_page(markdown))
+        parse = min(timeit.repeat(lambda: parse_page(markdown), number=REPEAT, repeat=3)) / REPEAT
+        load = min(timeit.repeat(lambda: loads(blob), number=REPEAT, repeat=3)) / REPEAT
+        label = f"{len(markdown) // 1024} KB md -> {len(blob) // 1024} KB blob"
+        print(f"{label:<28}parse {parse * 1e6:>9.1f} us  load {load * 1e6:>9.1f} us  {parse / load:>5.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import timeit
+
+from blockparser import parse_blocks
+from transformers import markdown_to_html_node
+
+FLAT = "# Heading\n\nSome **paragraph** text.\n\n- one\n- two\n\n> quote\n\n```\ncode\n\nmore\n```\n\n"
+REPEAT = 20
+
+def nested_list(depth, items=4):
+    lines = []
+    for level in range(depth):
+        indent = "  " * level
+        for i in range(items):
+            lines.append(f"{indent}- item {i} at depth {level}")
+    return "\n".join(lines)
+
+def nested_quote(depth, lines_per_level=4):
+    lines = []
+    for level in range(1, depth + 1):
+        for i in range(lines_per_level):
+            lines.append("> " * level + f"line {i} at depth {level}")
+        lines.append("> " * level)
+    return "\n".join(lines)
+
+def per_kb(func, text):
+    seconds = min(timeit.repeat(lambda: func(text), number=REPEAT, repeat=3)) / REPEAT
+    return seconds / (len(text) / 1024) * 1e6
+
+def main():
+    print(f"Block parse cost (us per KB of input, {REPEAT} runs)")
+    for scale in (16, 64, 256):
+        text = FLAT * scale
+        print(f"{f'flat x{scale} ({len(text) // 1024} KB)':<32}"
+              f"parse {per_kb(parse_blocks, text):>8.2f}  render {per_kb(markdown_to_html_node, text):>8.2f}")
+    for depth in (10, 40, 160):
+        text = nested_list(depth)
+        print(f"{f'list depth {depth} ({len(text) // 1024} KB)':<32}parse {per_kb(parse_blocks, text):>8.2f}")
+    for depth in (10, 40, 160):
+        text = nested_quote(depth)
+        print(f"{f'quote depth {depth} ({len(text) // 1024} KB)':<32}parse {per_kb(parse_blocks, text):>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import timeit
+
+from inline import default_inline_parser
+from textnode import TextNode, TextType
+from transformers import split_nodes_delimiter, split_nodes_image, split_nodes_link
+
+PARAGRAPH = (
+    "In the vast and intricate weave of the **legendarium**, amidst heroes of _renown_ "
+    "and tales of high adventure, there is `Tom` and an ![image](/images/tom.png) "
+    "as well as a [link](/blog/tom) that points somewhere else entirely. "
+) * 4
+EXTRA_DELIMITERS = ["~~", "==", "^^", "++", "%%", "$$", "::", ";;"]
+REPEAT = 2000
+
+def legacy_parse(text, extra):
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    for delimiter in extra:
+        nodes = split_nodes_delimiter(nodes, delimiter, TextType.TEXT)
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    return nodes
+
+def never_matches(text, pos, parser):
+    return None
+
+def bench(label, func):
+    seconds = timeit.timeit(func, number=REPEAT)
+    print(f"{label:<36}{seconds / REPEAT * 1e6:>10.2f} us/paragraph")
+
+def main():
+    print(f"Inline parse cost, {len(PARAGRAPH)} char paragraph, {REPEAT} runs")
+    for count in (0, 4, 8):
+        extra = EXTRA_DELIMITERS[:count]
+        bench(f"split_nodes passes +{count} syntax", lambda: legacy_parse(PARAGRAPH, extra))
+
+        parser = default_inline_parser.copy()
+        for delimiter in extra:
+            parser.register(delimiter[0], never_matches)
+        bench(f"single scan registry +{count} syntax", lambda: parser.parse(PARAGRAPH))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import random, time
+
+from renderer import RenderOptions, render
+
+RUNS = 30
+# p99 latency targets in ms per input size in characters.
+P99_TARGETS_MS = {10_000: 100, 100_000: 1000}
+
+def adversarial_inputs(size):
+    return {
+        "underscores": "_" * size,
+        "open emphasis": "_a " * (size // 3),
+        "nested emphasis": "**a _a " * (size // 14) + "x" + " a_ a**" * (size // 14),
+        "emphasis in link": "[" + "**a _a " * (size // 14) + "x" + " a_ a**" * (size // 14) + "](/x)",
+        "brackets": "[" * size,
+        "open links": "[a](" * (size // 4),
+        "open images": "![" * (size // 2),
+        "backticks": "`a" * (size // 2),
+        "deep quotes": ">" * size + " x",
+        "deep lists": "\n".join(" " * (2 * (i % 50)) + "- x" for i in range(size // 50)),
+        "headings": "# a\n" * (size // 4),
+        "open comments": "```js\n" + "/*" * (size // 2) + "\n```",
+        "random": random_markdown(size),
+    }
+
+def random_markdown(size):
+    rng = random.Random(size)
+    alphabet = ["_", "*", "**", "`", "[", "]", "(", ")", "!", ">", "- ", "1. ", "# ", " ", "\n", "\n\n", "word", "```"]
+    parts = []
+    length = 0
+    while length < size:
+        part = rng.choice(alphabet)
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+def main():
+    options = RenderOptions(max_input_size=2 * max(P99_TARGETS_MS))
+    print(f"render() latency over {RUNS} runs")
+    failed = 0
+    for size, target in P99_TARGETS_MS.items():
+        print(f"{size // 1000} KB inputs, p99 target {target} ms")
+        for name, markdown in adversarial_inputs(size).items():
+            samples = []
+            for _ in range(RUNS):
+                start = time.perf_counter()
+                render(markdown, options)
+                samples.append((time.perf_counter() - start) * 1000)
+            p50 = percentile(samples, 0.50)
+            p99 = percentile(samples, 0.99)
+            status = "ok" if p99 <= target else "SLOW"
+            failed += status != "ok"
+            print(f"\t{name:<16} p50 {p50:>8.2f} ms  p99 {p99:>8.2f} ms  {status}")
+    print("All inputs within target" if not failed else f"{failed} input(s) over target")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import timeit
+
+from blocks import BlockType
+from htmlnode import ParentNode
+from inline import plain_text
+from transformers import default_block_registry, markdown_to_html_node, note_text, text_to_textnodes, textnodes_to_children
+
+SECTION = """## Section heading number {i}
+
+Some paragraph text with **bold** and _italic_ words that sits under the heading.
+
+### A repeated sub heading
+
+- a list item
+- another list item
+"""
+SECTIONS = 20
+PAGE = "# Page Title\n\n" + "\n".join(SECTION.format(i=i) for i in range(SECTIONS))
+HEADINGS = 1 + 2 * SECTIONS
+REPEAT = 300
+
+def heading_without_id(block, state=None):
+    # block_to_heading with everything but the slug: the same inline parse,
+    # word count and title capture, so the difference is the id alone.
+    heading_size = block.find(" ")
+    text_nodes = text_to_textnodes(block[heading_size+1:], state)
+    children = textnodes_to_children(text_nodes, state)
+    if state is None:
+        return ParentNode(f"h{heading_size}", children)
+
+    note_text(state, block[heading_size+1:], text_nodes)
+    heading_text = plain_text(text_nodes)
+    if heading_size == 1 and state.title is None:
+        state.title = heading_text
+    return ParentNode(f"h{heading_size}", children)
+
+def main():
+    plain = default_block_registry.copy()
+    plain.register_renderer(BlockType.HEADING, heading_without_id)
+
+    base = min(timeit.repeat(lambda: markdown_to_html_node(PAGE, plain), number=REPEAT, repeat=5)) / REPEAT
+    anchored = min(timeit.repeat(lambda: markdown_to_html_node(PAGE), number=REPEAT, repeat=5)) / REPEAT
+    print(f"Heading anchors, {HEADINGS} headings per page, {REPEAT} runs")
+    print(f"{'without ids':<36}{base * 1e6:>10.2f} us/page")
+    print(f"{'with ids (memoized slugs)':<36}{anchored * 1e6:>10.2f} us/page")
+    print(f"{'overhead':<36}{(anchored - base) / base * 100:>10.2f} %")
+    print(f"{'overhead per heading':<36}{(anchored - base) / HEADINGS * 1e6:>10.2f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+import re
+
+LIST_MARKER = re.compile(r"(?:-|(\d{1,9})\.)( *)")
+
+class Leaf():
+    def __init__(self, kind, line):
+        self.kind = kind
+        self.line = line
+        self.lines = []
+        self.closed = False
+
+    def text(self):
+        if self.kind == "fence" and not self.closed:
+            return "\n".join(self.lines) + "\n```"
+        return "\n".join(self.lines)
+
+    def __repr__(self):
+        return f"Leaf({self.kind}, {self.line}, {self.lines})"
+
+class Container():
+    def __init__(self, kind, line, content_indent=0, ordered=False, start=1):
+        self.kind = kind
+        self.line = line
+        self.children = []
+        self.content_indent = content_indent
+        self.ordered = ordered
+        self.start = start
+        self.loose = False
+
+    def __repr__(self):
+        return f"Container({self.kind}, {self.line}, {self.children})"
+
+class BlockParser():
+    # Single pass over the lines with a stack of open containers (document,
+    # quote, list, item). Each line first walks the stack to see which open
+    # containers it continues, stripping their prefixes by advancing an offset,
+    # then opens any new containers and finally feeds the open leaf block
+    # (a paragraph or a fenced code block). No line is ever scanned twice.
+    #
+    # With max_depth set, markers that would open a container deeper than that
+    # are left as text of the innermost block.
+    def __init__(self, max_depth=None):
+        self.max_depth = max_depth
+
+    def parse(self, markdown):
+        self.lines = markdown.replace("\r\n", "\n").split("\n")
+        self.root = Container("document", 0)
+        self.stack = [self.root]
+        self.leaf = None
+        self.previous_blank = False
+        for number, line in enumerate(self.lines):
+            self.add_line(number, line)
+        self.close_leaf()
+        return self.root
+
+    def add_line(self, number, line):
+        stack = self.stack
+        pos = 0
+        matched = 1
+        new_item = False
+        p = skip_spaces(line, pos)
+        while matched < len(stack):
+            container = stack[matched]
+            if p < pos:
+                p = skip_spaces(line, pos)
+            if container.kind == "quote":
+                if p - pos > 3 or not line.startswith(">", p):
+                    break
+                pos = skip_one_space(line, p + 1)
+            elif container.kind == "item":
+                if p == len(line):
+                    pos = p
+                elif p - pos >= container.content_indent:
+                    pos += container.content_indent
+                else:
+                    new_item = continues_list(stack[matched - 1], line, pos, p)
+                    if not new_item:
+                        matched -= 1
+                    break
+            matched += 1
+
+        leaf = self.leaf
+        blank = is_blank(line, pos)
+        if leaf is not None and leaf.kind == "fence" and matched == len(stack):
+            self.add_fence_line(line, pos)
+            return
+
+        if matched < len(stack):
+            if (leaf is not None and leaf.kind == "paragraph" and not blank
+                    and not new_item and not self.starts_block(line, pos)):
+                leaf.lines.append(line[pos:].strip())
+                return
+            self.close_leaf()
+            del stack[matched:]
+
+        if blank:
+            if self.leaf is not None:
+                self.close_leaf()
+            self.previous_blank = True
+            return
+
+        pos = self.open_containers(number, line, pos)
+        if is_blank(line, pos):
+            self.previous_blank = False
+            return
+
+        p = skip_spaces(line, pos)
+        if p - pos <= 3 and line.startswith("```", p):
+            self.close_leaf()
+            fence = Leaf("fence", number)
+            fence.lines.append(line[p:].rstrip())
+            self.add_child(fence)
+            self.leaf = fence
+        elif self.leaf is not None:
+            self.leaf.lines.append(line[p:].rstrip())
+        else:
+            paragraph = Leaf("paragraph", number)
+            paragraph.lines.append(line[p:].rstrip())
+            self.add_child(paragraph)
+            self.leaf = paragraph
+        self.previous_blank = False
+
+    def open_containers(self, number, line, pos):
+        stack = self.stack
+        while True:
+            p = skip_spaces(line, pos)
+            if p - pos > 3:
+                return pos
+            if self.max_depth is not None and len(stack) > self.max_depth:
+                return pos
+
+            if line.startswith(">", p):
+                self.close_leaf()
+                quote = Container("quote", number)
+                self.add_child(quote)
+                stack.append(quote)
+                pos = skip_one_space(line, p + 1)
+                continue
+
+            marker = LIST_MARKER.match(line, p)
+            if marker is None or not self.can_open_item(marker, line):
+                return pos
+
+            self.close_leaf()
+            ordered = marker[1] is not None
+            top = stack[-1]
+            if top.kind == "list" and top.ordered == ordered:
+                if self.previous_blank:
+                    top.loose = True
+            else:
+                if top.kind == "list":
+                    stack.pop()
+                start = int(marker[1]) if ordered else 1
+                new_list = Container("list", number, ordered=ordered, start=start)
+                self.add_child(new_list)
+                stack.append(new_list)
+
+            spaces = len(marker[2])
+            if marker.end() == len(line) or spaces > 4:
+                spaces = 1
+            width = marker.start(2) - p + spaces
+            item = Container("item", number, content_indent=(p - pos) + width)
+            stack[-1].children.append(item)
+            stack.append(item)
+            pos = min(p + width, len(line))
+
+    def can_open_item(self, marker, line):
+        empty = marker.end() == len(line)
+        if not marker[2] and not empty:
+            return False
+        if self.leaf is None or self.leaf.kind != "paragraph":
+            return True
+        if empty:
+            return False
+        return marker[1] is None or int(marker[1]) == 1
+
+    def starts_block(self, line, pos):
+        p = skip_spaces(line, pos)
+        if p - pos > 3:
+            return False
+        if line.startswith((">", "```"), p):
+            return True
+        marker = LIST_MARKER.match(line, p)
+        return marker is not None and self.can_open_item(marker, line)
+
+    def add_fence_line(self, line, pos):
+        p = skip_spaces(line, pos)
+        if p - pos <= 3 and line.startswith("```", p) and line[p:].strip().strip("`") == "":
+            self.leaf.lines.append(line[p:].rstrip())
+            self.leaf.closed = True
+            self.leaf = None
+        else:
+            self.leaf.lines.append(line[pos:])
+        self.previous_blank = False
+
+    def add_child(self, node):
+        parent = self.stack[-1]
+        if self.previous_blank and parent.kind == "item" and parent.children:
+            self.stack[-2].loose = True
+        parent.children.append(node)
+
+    def close_leaf(self):
+        self.leaf = None
+
+def parse_blocks(markdown, max_depth=None):
+    return BlockParser(max_depth).parse(markdown)
+
+def continues_list(container, line, pos, p):
+    if p - pos > 3:
+        return False
+    marker = LIST_MARKER.match(line, p)
+    if marker is None or (not marker[2] and marker.end() != len(line)):
+        return False
+    return container.ordered == (marker[1] is not None)
+
+def skip_spaces(line, pos):
+    while pos < len(line) and line[pos] == " ":
+        pos += 1
+    return pos
+
+def skip_one_space(line, pos):
+    if line.startswith(" ", pos):
+        return pos + 1
+    return pos
+
+def is_blank(line, pos):
+    return pos >= len(line) or line[pos:].isspace()
@@ -8,25 +8,56 @@ class BlockType(Enum):
     UNORDERED_LIST = "unordered_list"
     ORDERED_LIST = "ordered_list"
 
+class BlockRegistry():
+    # Block types are looked up by the first character of the block, so only the
+    # predicates registered for that character run. Anything no predicate claims
+    # is a paragraph. Block types may be BlockType members or any hashable name.
+    # Renderers are called as renderer(block, state) with the page's ParseState.
+    def __init__(self):
+        self.candidates = {}
+        self.renderers = {}
+
+    def register(self, block_type, triggers, predicate, renderer=None):
+        for trigger in triggers:
+            if len(trigger) != 1:
+                raise ValueError(f"Block trigger must be a single character: '{trigger}'")
+            self.candidates.setdefault(trigger, []).append((block_type, predicate))
+        if renderer is not None:
+            self.renderers[block_type] = renderer
+
+    def register_renderer(self, block_type, renderer):
+        self.renderers[block_type] = renderer
+
+    def copy(self):
+        registry = BlockRegistry()
+        for trigger, candidates in self.candidates.items():
+            registry.candidates[trigger] = list(candidates)
+        registry.renderers = dict(self.renderers)
+        return registry
+
+    def block_type(self, block):
+        for block_type, predicate in self.candidates.get(block[:1], ()):
+            if predicate(block):
+                return block_type
+        return BlockType.PARAGRAPH
+
+    def render(self, block, state=None, block_type=None):
+        if block_type is None:
+            block_type = self.block_type(block)
+        renderer = self.renderers.get(block_type)
+        if renderer is None:
+            raise ValueError("Unknown Block Type")
+        return renderer(block, state)
+
 def block_to_block_type(block):
-    if is_heading(block):
-        return BlockType.HEADING
-    if is_code_block(block):
-        return BlockType.CODE
-    if is_comment_block(block):
-        return BlockType.QUOTE
-    if is_unordered_list(block):
-        return BlockType.UNORDERED_LIST
-    if is_ordered_list(block):
-        return BlockType.ORDERED_LIST
-    return BlockType.PARAGRAPH
+    return default_block_registry.block_type(block)
 
 def is_heading(block):
     return block.startswith(("# ", "## ", "### ", "#### ", "##### ", "###### "))
 
 def is_code_block(block):
-    lines = block.split("\n")
-    return len(lines) > 1 and lines[0].startswith("```") and lines[-1].startswith("```")
+    last_line = block.rfind("\n")
+    return last_line != -1 and block.startswith("```") and block.startswith("```", last_line + 1)
 
 def is_comment_block(block):
     lines = block.split("\n")
@@ -52,4 +83,12 @@ def is_ordered_list(block):
             return False
     return True
 
+default_block_registry = BlockRegistry()
+default_block_registry.register(BlockType.HEADING, "#", is_heading)
+default_block_registry.register(BlockType.CODE, "`", is_code_block)
+default_block_registry.register(BlockType.QUOTE, ">", is_comment_block)
+default_block_registry.register(BlockType.UNORDERED_LIST, "-", is_unordered_list)
+default_block_registry.register(BlockType.ORDERED_LIST, "1", is_ordered_list)
 
+def register_block_type(block_type, triggers, predicate, renderer=None):
+    default_block_registry.register(block_type, triggers, predicate, renderer)
@@ -0,0 +1,94 @@
+import atexit, json, sys, time
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVEL_NAMES = {DEBUG: "debug", INFO: "info", WARNING: "warning", ERROR: "error"}
+
+class BuildLog():
+    # Per-file events (rendered, kept, copied, removed) only bump a counter
+    # unless the level is DEBUG; at INFO the counters are summarised on one
+    # progress line at most every `interval` seconds. Lines are buffered and
+    # written batch_size at a time; progress lines, warnings and errors are
+    # written straight away.
+    #
+    # The stream is looked up on every flush, so redirecting sys.stdout (as
+    # the build daemon does) captures the log too.
+    def __init__(self, level=INFO, json_events=False, interval=1.0, batch_size=256, stream=None, clock=time.monotonic):
+        self.level = level
+        self.json_events = json_events
+        self.interval = interval
+        self.batch_size = batch_size
+        self.stream = stream
+        self.clock = clock
+        self.counts = {}
+        self.buffer = []
+        self.last_progress = clock()
+
+    def configure(self, level=INFO, json_events=False):
+        self.flush()
+        self.level = level
+        self.json_events = json_events
+        self.counts = {}
+        self.last_progress = self.clock()
+
+    def file_event(self, event, message, *args, **fields):
+        # message is a str.format template filled from args only when the line
+        # is actually written, so per-file calls cost a counter bump otherwise.
+        self.counts[event] = self.counts.get(event, 0) + 1
+        if self.level <= DEBUG:
+            self.emit(DEBUG, event, message.format(*args) if args else message, fields)
+        elif self.level <= INFO:
+            now = self.clock()
+            if now - self.last_progress >= self.interval:
+                self.last_progress = now
+                self.emit(INFO, "progress", f"Progress: {self.summary()}..", dict(self.counts))
+                self.flush()
+
+    def debug(self, message, event="message", **fields):
+        self.emit(DEBUG, event, message, fields)
+
+    def info(self, message, event="message", **fields):
+        self.emit(INFO, event, message, fields)
+
+    def warning(self, message, event="message", **fields):
+        self.emit(WARNING, event, message, fields)
+
+    def error(self, message, event="message", **fields):
+        self.emit(ERROR, event, message, fields)
+
+    def emit(self, level, event, message, fields):
+        if level < self.level:
+            return
+        if self.json_events:
+            line = json.dumps({"time": time.time(), "level": LEVEL_NAMES[level], "event": event, "message": message.strip(), **fields})
+        else:
+            line = message
+        if level >= WARNING:
+            self.flush()
+            print(line, file=sys.stderr if self.stream is None else self.stream)
+            return
+        self.buffer.append(line)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def summary(self):
+        return ", ".join(f"{count} {event}" for event, count in sorted(self.counts.items()))
+
+    def finish(self):
+        if self.counts:
+            self.emit(INFO, "summary", f"Done: {self.summary()}", dict(self.counts))
+        self.flush()
+        self.counts = {}
+
+    def flush(self):
+        if not self.buffer:
+            return
+        stream = sys.stdout if self.stream is None else self.stream
+        stream.write("\n".join(self.buffer) + "\n")
+        stream.flush()
+        self.buffer = []
+
+log = BuildLog()
+atexit.register(log.flush)
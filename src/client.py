@@ -0,0 +1,51 @@
+import json, socket, sys
+
+socket_path = "./.cache/daemon.sock"
+
+def request(payload, path=socket_path, timeout=None):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        client.connect(path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        client.close()
+        return None
+    with client:
+        client.sendall(json.dumps(payload).encode() + b"\n")
+        reader = client.makefile("rb")
+        line = reader.readline()
+        reader.close()
+    return json.loads(line)
+
+def build(args, path=socket_path):
+    response = request({"command": "build", "args": args}, path)
+    if response is None:
+        import main
+        print("Build daemon not running, building in-process..", file=sys.stderr)
+        return main.main(args)
+    if "error" in response:
+        print(f"Daemon error: {response['error']}", file=sys.stderr)
+        return 1
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["status"]
+
+def render(page_path, basepath="/", path=socket_path):
+    response = request({"command": "render", "path": page_path, "basepath": basepath}, path)
+    if response is None:
+        import main
+        return main.render_page(page_path, main.template_loc, basepath)[0]
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    return response["html"]
+
+def run(argv):
+    if argv[:1] == ["render"]:
+        sys.stdout.write(render(*argv[1:3]))
+        return 0
+    if argv[:1] == ["stop"]:
+        return 0 if request({"command": "stop"}) is not None else 1
+    return build(argv)
+
+if __name__ == "__main__":
+    sys.exit(run(sys.argv[1:]))
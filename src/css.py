@@ -0,0 +1,144 @@
+import re
+
+COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+WHITESPACE = re.compile(r"\s+")
+PSEUDO = re.compile(r"::?[\w-]+(?:\([^)]*\))?")
+ATTRIBUTE = re.compile(r"\[[^\]]*\]")
+SIMPLE_SELECTOR = re.compile(r"([.#]?)(-?[A-Za-z_][\w-]*)")
+MARKUP_TAG = re.compile(r"<([a-zA-Z][\w-]*)([^>]*)>")
+MARKUP_ATTRIBUTE = re.compile(r"\b(class|id)=\"?([^\">]*)")
+GROUPING_AT_RULES = ("@media", "@supports", "@layer", "@container")
+
+class StyleRule():
+    def __init__(self, selectors, body):
+        self.selectors = selectors
+        self.body = body
+        self.requirements = [selector_requirements(selector) for selector in selectors]
+
+    def to_css(self, used):
+        selectors = [
+            selector for selector, required in zip(self.selectors, self.requirements)
+            if required <= used
+        ]
+        if not selectors:
+            return ""
+        return f"{','.join(selectors)}{{{self.body}}}"
+
+class GroupRule():
+    def __init__(self, prelude, rules):
+        self.prelude = prelude
+        self.rules = rules
+
+    def to_css(self, used):
+        inner = "".join(rule.to_css(used) for rule in self.rules)
+        if not inner:
+            return ""
+        return f"{self.prelude}{{{inner}}}"
+
+class RawRule():
+    def __init__(self, text):
+        self.text = text
+
+    def to_css(self, used):
+        return self.text
+
+class CSSIndex():
+    # A stylesheet parsed once per build into rules that know which tags,
+    # .classes and #ids each selector needs. select(used) returns the rules a
+    # page needs, memoized per distinct set since most pages share one, and
+    # remembers everything selected so prune() can emit a site-wide sheet.
+    # inline says whether pages get their rules inlined or are only noted.
+    def __init__(self, css, inline=True):
+        self.rules = parse_rules(COMMENT.sub("", css), 0)[0]
+        self.inline = inline
+        self.selected = {}
+        self.used = set()
+
+    def select(self, used):
+        used = frozenset(used)
+        self.used |= used
+        css = self.selected.get(used)
+        if css is None:
+            css = "".join(rule.to_css(used) for rule in self.rules)
+            self.selected[used] = css
+        return css
+
+    def note(self, used):
+        self.used |= used
+
+    def prune(self):
+        return "".join(rule.to_css(self.used) for rule in self.rules)
+
+def parse_rules(css, pos):
+    rules = []
+    while True:
+        while pos < len(css) and css[pos].isspace():
+            pos += 1
+        if pos >= len(css):
+            return rules, pos
+        if css[pos] == "}":
+            return rules, pos + 1
+
+        brace = css.find("{", pos)
+        if css[pos] == "@":
+            semicolon = css.find(";", pos)
+            if semicolon != -1 and (brace == -1 or semicolon < brace):
+                rules.append(RawRule(compact(css[pos:semicolon + 1])))
+                pos = semicolon + 1
+                continue
+        if brace == -1:
+            return rules, len(css)
+
+        prelude = compact(css[pos:brace])
+        if prelude.startswith(GROUPING_AT_RULES):
+            children, pos = parse_rules(css, brace + 1)
+            rules.append(GroupRule(prelude, children))
+        elif prelude.startswith("@"):
+            end = matching_brace(css, brace)
+            rules.append(RawRule(prelude + compact(css[brace:end])))
+            pos = end
+        else:
+            end = css.find("}", brace)
+            if end == -1:
+                end = len(css)
+            selectors = [compact(selector) for selector in prelude.split(",")]
+            rules.append(StyleRule(selectors, compact(css[brace + 1:end]).strip(" ;")))
+            pos = end + 1
+
+def matching_brace(css, pos):
+    depth = 0
+    while pos < len(css):
+        if css[pos] == "{":
+            depth += 1
+        elif css[pos] == "}":
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos += 1
+    return pos
+
+def compact(text):
+    return WHITESPACE.sub(" ", text).strip()
+
+def selector_requirements(selector):
+    # The tags, classes and ids a selector mentions; a page that uses all of
+    # them may match it. Pseudo-classes and attribute tests are ignored, so
+    # this can only ever keep too much, never too little.
+    selector = PSEUDO.sub(" ", ATTRIBUTE.sub(" ", selector))
+    required = set()
+    for match in SIMPLE_SELECTOR.finditer(selector):
+        prefix, name = match.groups()
+        required.add(prefix + name if prefix else name.lower())
+    return frozenset(required)
+
+def markup_selectors(html, used=None):
+    if used is None:
+        used = set()
+    for match in MARKUP_TAG.finditer(html):
+        used.add(match[1].lower())
+        for attribute in MARKUP_ATTRIBUTE.finditer(match[2]):
+            if attribute[1] == "class":
+                used.update(f".{name}" for name in attribute[2].split())
+            else:
+                used.add(f"#{attribute[2].strip()}")
+    return used
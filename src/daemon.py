@@ -0,0 +1,102 @@
+import io, json, os, socket, socketserver, sys
+
+from contextlib import redirect_stderr, redirect_stdout
+
+import main
+import metrics
+from astcache import ASTCache
+
+socket_path = "./.cache/daemon.sock"
+memory_size = 4096
+
+class BuildHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        try:
+            response = self.server.daemon.handle_request(json.loads(line))
+        except Exception as e:
+            response = {"ok": False, "error": str(e)}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+        if response.get("stopping"):
+            self.server.stopping = True
+
+class BuildServer(socketserver.UnixStreamServer):
+    # Requests are handled one at a time, so builds never overlap and the
+    # redirected stdout of one build cannot mix with another's.
+    def __init__(self, path, daemon):
+        self.daemon = daemon
+        self.stopping = False
+        super().__init__(path, BuildHandler)
+
+class BuildDaemon():
+    # Warm state kept between requests: imported modules, the template cache in
+    # main and the in-memory parse cache, so a build only pays for what changed.
+    def __init__(self, cache=None):
+        self.cache = cache if cache is not None else ASTCache(main.cache_dir, memory_size)
+        self.builds = 0
+        self.metrics = metrics.enable()
+
+    def handle_request(self, request):
+        command = request.get("command")
+        if command == "ping":
+            return {"ok": True, "pid": os.getpid(), "builds": self.builds}
+        if command == "build":
+            return self.build(request.get("args", []))
+        if command == "render":
+            return self.render(request["path"], request.get("basepath", "/"))
+        if command == "metrics":
+            if request.get("format") == "json":
+                return {"ok": True, "metrics": json.loads(self.metrics.to_json())}
+            return {"ok": True, "text": self.metrics.to_prometheus()}
+        if command == "stop":
+            return {"ok": True, "stopping": True}
+        raise ValueError(f"Unknown command: '{command}'")
+
+    def build(self, args):
+        self.cache.hits = 0
+        self.cache.misses = 0
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                status = main.main(args, self.cache)
+            except SystemExit as e:
+                status = e.code if isinstance(e.code, int) else 1
+        self.builds += 1
+        return {"ok": status == 0, "status": status, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+    def render(self, path, basepath):
+        page, state = main.render_page(path, main.template_loc, basepath, self.cache)
+        return {"ok": True, "html": page, "title": state.title}
+
+def is_running(path):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        client.close()
+
+def serve(path=socket_path):
+    if os.path.exists(path):
+        if is_running(path):
+            print(f"Daemon already listening on {path}", file=sys.stderr)
+            return 1
+        os.remove(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    server = BuildServer(path, BuildDaemon())
+    print(f"Build daemon listening on {path}")
+    try:
+        while not server.stopping:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.remove(path)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(serve())
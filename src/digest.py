@@ -0,0 +1,111 @@
+import hashlib, os, sys
+
+ROOT = "./"
+CHUNK_SIZE = 1 << 20
+
+# A Merkle tree over an output directory: every file is keyed by its path
+# relative to the root and every directory (ending in "/", the root is "./")
+# by the sha256 of its sorted "kind digest name" lines. Equal roots mean equal
+# trees, so two builds compare in O(1) when they match.
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def tree_digest(root):
+    digests = {}
+    hash_dir(root, "", digests)
+    return digests
+
+def hash_dir(path, rel, digests):
+    digest = hashlib.sha256()
+    with os.scandir(path) as entries:
+        entries = sorted(entries, key=lambda entry: entry.name)
+    for entry in entries:
+        if entry.is_dir():
+            child = hash_dir(entry.path, f"{rel}{entry.name}/", digests)
+            kind = "d"
+        else:
+            child = digests[f"{rel}{entry.name}"] = hash_file(entry.path)
+            kind = "f"
+        digest.update(f"{kind} {child} {entry.name}\n".encode())
+    digests[rel or ROOT] = digest.hexdigest()
+    return digests[rel or ROOT]
+
+def write_digest(path, digests):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        for key in sorted(digests):
+            f.write(f"{digests[key]}  {key}\n")
+    os.replace(tmp_path, path)
+
+def read_digest(path):
+    digests = {}
+    with open(path) as f:
+        for line in f:
+            digest, key = line.rstrip("\n").split("  ", 1)
+            digests[key] = digest
+    return digests
+
+def load(path):
+    if os.path.isdir(path):
+        return tree_digest(path)
+    return read_digest(path)
+
+def children(digests):
+    tree = {}
+    for key in digests:
+        if key != ROOT:
+            parent = key.rstrip("/").rpartition("/")[0]
+            tree.setdefault(f"{parent}/" if parent else ROOT, []).append(key)
+    return tree
+
+def subtree_files(key, tree):
+    if not key.endswith("/"):
+        yield key
+        return
+    for child in tree.get(key, ()):
+        yield from subtree_files(child, tree)
+
+def compare(a, b):
+    # Descends only into directories whose digests differ; a subtree present
+    # on one side only is listed file by file.
+    if a.get(ROOT) == b.get(ROOT):
+        return []
+    tree_a, tree_b = children(a), children(b)
+    differences = []
+    stack = [ROOT]
+    while stack:
+        directory = stack.pop()
+        for key in set(tree_a.get(directory, ())) | set(tree_b.get(directory, ())):
+            if key not in b:
+                differences.extend(("removed", path) for path in subtree_files(key, tree_a))
+            elif key not in a:
+                differences.extend(("added", path) for path in subtree_files(key, tree_b))
+            elif a[key] == b[key]:
+                continue
+            elif key.endswith("/"):
+                stack.append(key)
+            else:
+                differences.append(("changed", key))
+    differences.sort(key=lambda difference: difference[1])
+    return differences
+
+def run(argv):
+    if len(argv) != 3 or argv[0] != "verify":
+        print("usage: digest.py verify <build dir or .digest> <build dir or .digest>", file=sys.stderr)
+        return 2
+    differences = compare(load(argv[1]), load(argv[2]))
+    for status, key in differences:
+        print(f"{status}: {key}")
+    if differences:
+        print(f"{len(differences)} file(s) differ", file=sys.stderr)
+        return 1
+    print("Builds are identical")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(run(sys.argv[1:]))
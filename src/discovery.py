@@ -0,0 +1,144 @@
+import os, subprocess
+
+from datetime import date, datetime, timezone
+from fnmatch import fnmatchcase
+from itertools import islice
+from pathlib import Path
+
+from errors import MarkdownError
+from frontmatter import read_front_matter
+from inventory import FILE, scan
+
+class PageSource():
+    # A markdown file found under the content directory, before it is read or
+    # parsed. name is the source path relative to the content directory,
+    # rel_path the output path relative to a target's out_dir and url_path the
+    # URL relative to a target's base path.
+    def __init__(self, source_path, rel_path, url_path, section, mtime, name=None):
+        self.source_path = source_path
+        self.name = name
+        self.rel_path = rel_path
+        self.url_path = url_path
+        self.section = section
+        self.mtime = mtime
+
+    def url(self, base_path="/"):
+        return base_path + self.url_path
+
+    def __repr__(self):
+        return f"PageSource({self.source_path}, {self.rel_path})"
+
+def discover_pages(content_dir, inventory=None):
+    # Reads the markdown files out of the scan() table the build already made
+    # of the sources, so the content directory is walked once per build; the
+    # table is in sorted walk order, so pages and sitemaps keep the same order
+    # on every build. Without a table the content directory is scanned here.
+    if inventory is None:
+        inventory = scan(content_dir)
+    prefix = os.path.join(content_dir, "")
+    for path, entry in inventory.items():
+        if entry.kind != FILE or not path.startswith(prefix) or not path.endswith(".md"):
+            continue
+        name = Path(path[len(prefix):]).as_posix()
+        rel_dir, _, item = name.rpartition("/")
+        url_dir = f"{rel_dir}/" if rel_dir else ""
+        url_path = url_dir if item == "index.md" else f"{url_dir}{item[:-3]}.html"
+        rel_path = os.path.join(*rel_dir.split("/"), f"{item[:-3]}.html") if rel_dir else f"{item[:-3]}.html"
+        section = rel_dir.split("/", 1)[0] or None
+        yield PageSource(path, rel_path, url_path, section, entry.mtime / 1e9, name)
+
+def matches(page, patterns):
+    # A pattern matches the page's name ("blog/tom/index.md") or its source
+    # path; a pattern without wildcards also matches everything below it.
+    source_path = Path(page.source_path).as_posix().removeprefix("./")
+    for pattern in patterns:
+        pattern = pattern.removeprefix("./").rstrip("/")
+        for path in (page.name, source_path):
+            if fnmatchcase(path, pattern) or path.startswith(pattern + "/"):
+                return True
+    return False
+
+def select_pages(pages, include=(), exclude=(), rejected=None):
+    # Filters on paths alone, so rejected pages are never opened.
+    for page in pages:
+        if (include and not matches(page, include)) or (exclude and matches(page, exclude)):
+            if rejected is not None:
+                rejected.append(page)
+            continue
+        yield page
+
+def publish_date(value):
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+def published_pages(pages, drafts=False, future=False, today=None, rejected=None):
+    # Drops pages marked "draft: true" or dated after today, reading only their
+    # front matter. Pages whose front matter is broken are kept, so the render
+    # step reports the error.
+    if drafts and future:
+        yield from pages
+        return
+    if today is None:
+        today = date.today()
+    for page in pages:
+        try:
+            front_matter = read_front_matter(page.source_path)
+        except MarkdownError:
+            yield page
+            continue
+        published = publish_date(front_matter.get("date"))
+        if (not drafts and front_matter.get("draft") is True) or (not future and published is not None and published > today):
+            if rejected is not None:
+                rejected.append(page)
+            continue
+        yield page
+
+def commit_times(root):
+    # Last commit time of every file under root from a single git log, keyed
+    # like scan() paths; empty outside a git work tree or without git.
+    try:
+        result = subprocess.run(
+            ["git", "-c", "core.quotePath=false", "log", "--format=%x00%ct", "--name-only", "--relative", "--", "."],
+            cwd=root, capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return {}
+    times = {}
+    for commit in result.stdout.split("\0")[1:]:
+        stamp, _, names = commit.partition("\n")
+        for name in names.split("\n"):
+            if name:
+                times.setdefault(os.path.join(root, name), int(stamp))
+    return times
+
+class PageDates():
+    # The date sitemaps and feeds give a page, taken from the content rather
+    # than the checkout: the front matter "date", else SOURCE_DATE_EPOCH,
+    # else the source's last git commit, else its mtime.
+    def __init__(self, content_dir, environ=os.environ):
+        self.content_dir = content_dir
+        epoch = environ.get("SOURCE_DATE_EPOCH", "")
+        self.epoch = int(epoch) if epoch.isdigit() else None
+        self.commits = None
+
+    def time(self, page, front_matter):
+        published = publish_date(front_matter.get("date"))
+        if published is not None:
+            return datetime(published.year, published.month, published.day, tzinfo=timezone.utc).timestamp()
+        if self.epoch is not None:
+            return self.epoch
+        if self.commits is None:
+            self.commits = commit_times(self.content_dir)
+        return self.commits.get(page.source_path, page.mtime)
+
+def batched(pages, size):
+    pages = iter(pages)
+    while True:
+        batch = list(islice(pages, size))
+        if not batch:
+            return
+        yield batch
@@ -0,0 +1,33 @@
+class MarkdownError(ValueError):
+    def __init__(self, message, line=None):
+        super().__init__(message)
+        self.message = message
+        self.line = line
+
+class LimitError(MarkdownError):
+    pass
+
+class BuildError(Exception):
+    def __init__(self, path, message, line=None):
+        super().__init__(message)
+        self.path = path
+        self.message = message
+        self.line = line
+
+    def __str__(self):
+        if self.line is None:
+            return f"{self.path}: {self.message}"
+        return f"{self.path}:{self.line}: {self.message}"
+
+class TemplateError(ValueError):
+    def __init__(self, message, path=None, line=None):
+        super().__init__(message)
+        self.message = message
+        self.path = path
+        self.line = line
+
+    def __str__(self):
+        location = ":".join(str(part) for part in (self.path, self.line) if part is not None)
+        if not location:
+            return self.message
+        return f"{location}: {self.message}"
@@ -0,0 +1,50 @@
+from errors import MarkdownError
+
+DELIMITER = "---"
+
+def split_front_matter(markdown):
+    # Front matter is a block of "key: value" lines between two "---" lines at
+    # the very top of a page. It is replaced by blank lines so block line
+    # numbers in errors still match the source file.
+    if not markdown.startswith(DELIMITER):
+        return {}, markdown
+    lines = markdown.split("\n")
+    if lines[0].rstrip() != DELIMITER:
+        return {}, markdown
+
+    front_matter = {}
+    for number in range(1, len(lines)):
+        line = lines[number].rstrip()
+        if line == DELIMITER:
+            body = "\n" * (number + 1) + "\n".join(lines[number + 1:])
+            return front_matter, body
+        if not line or line.startswith("#"):
+            continue
+        key, colon, value = line.partition(":")
+        if not colon or not key.strip():
+            raise MarkdownError(f"Invalid front matter line: '{line}'", number + 1)
+        front_matter[key.strip()] = parse_value(value.strip())
+    raise MarkdownError("Unterminated front matter", 1)
+
+def read_front_matter(path):
+    # Reads only the front matter block of a file, so pages can be selected
+    # by their front matter without reading or parsing the markdown itself.
+    with open(path) as f:
+        first = f.readline()
+        if first.rstrip() != DELIMITER:
+            return {}
+        lines = [first]
+        for line in f:
+            lines.append(line)
+            if line.rstrip() == DELIMITER:
+                break
+    return split_front_matter("".join(lines))[0]
+
+def parse_value(value):
+    if value.startswith("[") and value.endswith("]"):
+        return [parse_value(item.strip()) for item in value[1:-1].split(",") if item.strip()]
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    if value in ("true", "false"):
+        return value == "true"
+    return value
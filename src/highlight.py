@@ -0,0 +1,139 @@
+import hashlib, re
+
+from htmlnode import LeafNode
+
+TOKEN_CACHE_SIZE = 4096
+
+class Lexer():
+    # A lexer is an ordered list of (token class, regex) rules folded into one
+    # alternation, so tokenizing is a single finditer over the code. Text that no
+    # rule matches is emitted as plain (None) tokens.
+    def __init__(self, rules):
+        self.classes = {}
+        parts = []
+        for i, (token_class, regex) in enumerate(rules):
+            self.classes[f"t{i}"] = token_class
+            parts.append(f"(?P<t{i}>{regex})")
+        self.pattern = re.compile("|".join(parts), re.MULTILINE)
+
+    def tokenize(self, code):
+        tokens = []
+        start = 0
+        for match in self.pattern.finditer(code):
+            if match.start() == match.end():
+                continue
+            if match.start() > start:
+                tokens.append((None, code[start:match.start()]))
+            tokens.append((self.classes[match.lastgroup], match.group()))
+            start = match.end()
+        if start < len(code):
+            tokens.append((None, code[start:]))
+        return tokens
+
+def keywords(*words):
+    return r"\b(?:" + "|".join(words) + r")\b"
+
+DOUBLE_STRING = r'"(?:[^"\\\n]|\\.)*"'
+SINGLE_STRING = r"'(?:[^'\\\n]|\\.)*'"
+NUMBER = r"\b\d+(?:\.\d+)?\b"
+CALL = r"\b[A-Za-z_]\w*(?=\()"
+
+lexers = {}
+
+def register_lexer(names, lexer):
+    for name in names:
+        lexers[name] = lexer
+
+register_lexer(("python", "py"), Lexer([
+    ("comment", r"#[^\n]*"),
+    ("string", r'"""[\s\S]*?(?:"""|\Z)|\'\'\'[\s\S]*?(?:\'\'\'|\Z)'),
+    ("string", DOUBLE_STRING + "|" + SINGLE_STRING),
+    ("keyword", keywords(
+        "and", "as", "assert", "async", "await", "break", "class", "continue", "def",
+        "del", "elif", "else", "except", "False", "finally", "for", "from", "global",
+        "if", "import", "in", "is", "lambda", "None", "nonlocal", "not", "or", "pass",
+        "raise", "return", "True", "try", "while", "with", "yield", "match", "case",
+    )),
+    ("number", NUMBER),
+    ("function", CALL),
+]))
+
+register_lexer(("javascript", "js", "typescript", "ts"), Lexer([
+    ("comment", r"//[^\n]*|/\*[\s\S]*?(?:\*/|\Z)"),
+    ("string", DOUBLE_STRING + "|" + SINGLE_STRING + r"|`(?:[^`\\]|\\.)*`"),
+    ("keyword", keywords(
+        "async", "await", "break", "case", "catch", "class", "const", "continue",
+        "default", "delete", "do", "else", "export", "extends", "false", "finally",
+        "for", "function", "if", "import", "in", "instanceof", "let", "new", "null",
+        "return", "switch", "this", "throw", "true", "try", "typeof", "undefined",
+        "var", "while", "yield",
+    )),
+    ("number", NUMBER),
+    ("function", CALL),
+]))
+
+register_lexer(("go", "golang"), Lexer([
+    ("comment", r"//[^\n]*|/\*[\s\S]*?(?:\*/|\Z)"),
+    ("string", DOUBLE_STRING + r"|`[^`]*`|'(?:[^'\\\n]|\\.)*'"),
+    ("keyword", keywords(
+        "break", "case", "chan", "const", "continue", "default", "defer", "else",
+        "fallthrough", "false", "for", "func", "go", "goto", "if", "import",
+        "interface", "map", "nil", "package", "range", "return", "select", "struct",
+        "switch", "true", "type", "var",
+    )),
+    ("number", NUMBER),
+    ("function", CALL),
+]))
+
+register_lexer(("bash", "sh", "shell"), Lexer([
+    ("comment", r"(?:^|(?<=\s))#[^\n]*"),
+    ("string", DOUBLE_STRING + "|'[^']*'"),
+    ("variable", r"\$\{[^}\n]*\}|\$\w+"),
+    ("keyword", keywords(
+        "case", "do", "done", "elif", "else", "esac", "export", "fi", "for",
+        "function", "if", "in", "local", "return", "then", "while",
+    )),
+    ("number", NUMBER),
+]))
+
+register_lexer(("json",), Lexer([
+    ("property", DOUBLE_STRING + r"(?=\s*:)"),
+    ("string", DOUBLE_STRING),
+    ("keyword", keywords("true", "false", "null")),
+    ("number", r"-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b"),
+]))
+
+token_cache = {}
+
+def tokenize(code, language):
+    lexer = lexers.get(language)
+    if lexer is None:
+        return None
+
+    key = (language, hashlib.sha1(code.encode()).digest())
+    tokens = token_cache.get(key)
+    if tokens is not None:
+        return tokens
+
+    tokens = lexer.tokenize(code)
+    if len(token_cache) >= TOKEN_CACHE_SIZE:
+        token_cache.pop(next(iter(token_cache)))
+    token_cache[key] = tokens
+    return tokens
+
+def highlight(code, language, used=None):
+    # used, when given, is a ParseState.selectors set that gets the span tag
+    # and token classes the returned nodes carry.
+    tokens = tokenize(code, language.lower())
+    if tokens is None:
+        return None
+
+    nodes = []
+    for token_class, text in tokens:
+        if token_class is None:
+            nodes.append(LeafNode(None, text))
+        else:
+            nodes.append(LeafNode("span", text, {"class": f"tok-{token_class}"}))
+            if used is not None:
+                used.update(("span", f".tok-{token_class}"))
+    return nodes
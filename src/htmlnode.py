@@ -5,14 +5,19 @@ class HTMLNode():
         self.children = children
         self.props = props
 
-    def to_html(self):
+    def to_html(self, minifier=None):
         raise NotImplementedError("HTMLNode to_html() should be overriden by child classes.")
 
-    def props_to_html(self):
+    def props_to_html(self, minifier=None):
         prop_string = ""
         if self.props is None:
             return prop_string
         
+        if minifier is not None:
+            for prop in self.props:
+                prop_string += minifier.attribute(prop, self.props[prop])
+            return prop_string
+
         for prop in self.props:
             prop_string += f" {prop}=\"{self.props[prop]}\""
 
@@ -33,14 +38,19 @@ class LeafNode(HTMLNode):
     def __init__(self, tag, value, props=None):
         super().__init__(tag, value, None, props)
 
-    def to_html(self):
+    def to_html(self, minifier=None):
         if self.value == None:
             raise ValueError("invalid HTML: no value")
         
         if self.tag == None:
+            if minifier is not None:
+                return minifier.text(self.value)
             return self.value
         
-        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+        value = self.value
+        if minifier is not None and self.tag != "code":
+            value = minifier.text(value)
+        return f"<{self.tag}{self.props_to_html(minifier)}>{value}</{self.tag}>"
     
     def __repr__(self):
         return f"LeafNode({self.tag}, {self.value}, {self.props})"
@@ -49,16 +59,18 @@ class ParentNode(HTMLNode):
     def __init__(self, tag, children, props=None):
         super().__init__(tag, None, children, props)
 
-    def to_html(self):
+    def to_html(self, minifier=None):
         if not self.tag:
             raise ValueError("invalid HTML: no tag")
         
         if not self.children:
             raise ValueError("invalid HTML: parent with no children")
         
-        html = f"<{self.tag}{self.props_to_html()}>"
+        html = f"<{self.tag}{self.props_to_html(minifier)}>"
+        if self.tag in ("pre", "code"):
+            minifier = None
         for child in self.children:
-            html += child.to_html()
+            html += child.to_html(minifier)
         html += f"</{self.tag}>"
         
         return html
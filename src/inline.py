@@ -0,0 +1,216 @@
+import re
+
+from htmlnode import HTMLNode
+from textnode import TextNode, TextType
+
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+LINK_PATTERN = re.compile(r"\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
+class InlineParser():
+    # Inline syntax is a table of trigger character -> parse functions, plus
+    # emphasis-style delimiters. A parse function is called as
+    # parse(text, pos, parser) with text[pos] == trigger and returns None (no
+    # match, keep scanning) or (node, end) where node is a TextNode, an HTMLNode
+    # or None (consume text[pos:end] without output).
+    #
+    # Delimiters are matched with a delimiter stack: an opener is recorded as a
+    # placeholder text node, and a closer wraps every node emitted since its
+    # opener, so emphasis nests without any re-scanning. Openers left unmatched,
+    # or skipped over by a closer, simply stay in the output as literal text.
+    #
+    # At most max_nesting openers are kept open at once; further delimiters are
+    # left as literal text, which bounds how deeply emphasis can nest. While a
+    # parse function runs, parser.nesting is the budget left at its position,
+    # for functions like link_parser that parse their own inner text.
+    def __init__(self, max_nesting=32):
+        self.parsers = {}
+        self.delimiters = {}
+        self.trigger_pattern = None
+        self.max_nesting = max_nesting
+        self.nesting = max_nesting
+
+    def register(self, trigger, parse):
+        if len(trigger) != 1:
+            raise ValueError(f"Inline trigger must be a single character: '{trigger}'")
+        self.parsers.setdefault(trigger, []).append(parse)
+        self.trigger_pattern = None
+
+    def register_delimiter(self, delimiter, text_type, intraword=True):
+        entries = self.delimiters.setdefault(delimiter[0], [])
+        entries.append((delimiter, text_type, intraword))
+        entries.sort(key=lambda entry: -len(entry[0]))
+        self.trigger_pattern = None
+
+    def copy(self):
+        parser = InlineParser(self.max_nesting)
+        for trigger, parsers in self.parsers.items():
+            parser.parsers[trigger] = list(parsers)
+        for trigger, entries in self.delimiters.items():
+            parser.delimiters[trigger] = list(entries)
+        return parser
+
+    def parse(self, text, max_nesting=None):
+        if max_nesting is None:
+            max_nesting = self.max_nesting
+        if self.trigger_pattern is None:
+            self.trigger_pattern = compile_triggers(list(self.parsers) + list(self.delimiters))
+
+        nodes = []
+        openers = []
+        open_counts = {}
+        start = 0
+        search = self.trigger_pattern.search
+        match = search(text)
+        while match:
+            pos = match.start()
+            trigger = text[pos]
+            result = None
+            self.nesting = max_nesting - len(openers)
+            for parse in self.parsers.get(trigger, ()):
+                result = parse(text, pos, self)
+                if result is not None:
+                    break
+            if result is not None:
+                node, end = result
+                if pos > start:
+                    nodes.append(TextNode(text[start:pos], TextType.TEXT))
+                if node is not None:
+                    nodes.append(node)
+                start = end
+                match = search(text, end)
+                continue
+
+            entry = self.match_delimiter(text, pos)
+            if entry is None:
+                match = search(text, pos + 1)
+                continue
+
+            delimiter, text_type, intraword = entry
+            end = pos + len(delimiter)
+            can_open, can_close = flanking(text, pos, end, intraword)
+            if can_close and open_counts.get(delimiter):
+                if pos > start:
+                    nodes.append(TextNode(text[start:pos], TextType.TEXT))
+                while True:
+                    opener, index = openers.pop()
+                    open_counts[opener] -= 1
+                    if opener == delimiter:
+                        break
+                children = nodes[index + 1:]
+                del nodes[index:]
+                if children:
+                    nodes.append(wrap_children(children, text_type))
+                else:
+                    nodes.append(TextNode(delimiter + delimiter, TextType.TEXT))
+                start = end
+            elif can_open and len(openers) < max_nesting:
+                if pos > start:
+                    nodes.append(TextNode(text[start:pos], TextType.TEXT))
+                open_counts[delimiter] = open_counts.get(delimiter, 0) + 1
+                openers.append((delimiter, len(nodes)))
+                nodes.append(TextNode(delimiter, TextType.TEXT))
+                start = end
+            match = search(text, end)
+
+        if start < len(text):
+            nodes.append(TextNode(text[start:], TextType.TEXT))
+        if openers:
+            nodes = merge_text(nodes)
+        return nodes
+
+    def match_delimiter(self, text, pos):
+        for entry in self.delimiters.get(text[pos], ()):
+            if text.startswith(entry[0], pos):
+                return entry
+        return None
+
+def compile_triggers(triggers):
+    if not triggers:
+        return re.compile(r"(?!)")
+    return re.compile("[" + "".join(re.escape(trigger) for trigger in set(triggers)) + "]")
+
+def flanking(text, pos, end, intraword):
+    before = text[pos - 1] if pos > 0 else " "
+    after = text[end] if end < len(text) else " "
+    before_space = before.isspace()
+    after_space = after.isspace()
+    before_punct = not before_space and not before.isalnum()
+    after_punct = not after_space and not after.isalnum()
+
+    left = not after_space and (not after_punct or before_space or before_punct)
+    right = not before_space and (not before_punct or after_space or after_punct)
+    if intraword:
+        return left, right
+    return left and (not right or before_punct), right and (not left or after_punct)
+
+def wrap_children(children, text_type):
+    if len(children) == 1 and isinstance(children[0], TextNode) and children[0].text_type == TextType.TEXT:
+        return TextNode(children[0].text, text_type)
+    children = merge_text(children)
+    return TextNode(plain_text(children), text_type, None, children)
+
+def merge_text(nodes):
+    merged = []
+    run = []
+    for node in nodes:
+        if isinstance(node, TextNode) and node.text_type == TextType.TEXT:
+            run.append(node.text)
+            continue
+        if run:
+            merged.append(TextNode("".join(run), TextType.TEXT))
+            run = []
+        merged.append(node)
+    if run:
+        merged.append(TextNode("".join(run), TextType.TEXT))
+    return merged
+
+def plain_text(nodes):
+    parts = []
+    for node in nodes:
+        if isinstance(node, HTMLNode):
+            parts.append(node.value or "")
+        else:
+            parts.append(node.text)
+    return "".join(parts)
+
+def code_parser(delimiter, text_type):
+    size = len(delimiter)
+    def parse(text, pos, parser):
+        if not text.startswith(delimiter, pos):
+            return None
+        end = text.find(delimiter, pos + size)
+        if end == -1:
+            return None
+        inner = text[pos + size:end]
+        node = TextNode(inner, text_type) if inner else None
+        return node, end + size
+    return parse
+
+def image_parser(text, pos, parser):
+    match = IMAGE_PATTERN.match(text, pos)
+    if match is None:
+        return None
+    return TextNode(match[1], TextType.IMAGE, match[2]), match.end()
+
+def link_parser(text, pos, parser):
+    match = LINK_PATTERN.match(text, pos)
+    if match is None:
+        return None
+    # The link wraps its text, so the text gets one level less than is left.
+    children = parser.parse(match[1], max(parser.nesting - 1, 0))
+    if all(isinstance(child, TextNode) and child.text_type == TextType.TEXT for child in children):
+        return TextNode(match[1], TextType.LINK, match[2]), match.end()
+    return TextNode(plain_text(children), TextType.LINK, match[2], children), match.end()
+
+default_inline_parser = InlineParser()
+default_inline_parser.register_delimiter("**", TextType.BOLD)
+default_inline_parser.register_delimiter("_", TextType.ITALIC, intraword=False)
+default_inline_parser.register("`", code_parser("`", TextType.CODE))
+default_inline_parser.register("!", image_parser)
+default_inline_parser.register("[", link_parser)
+
+def register_inline(trigger, parse):
+    default_inline_parser.register(trigger, parse)
+
+def register_delimiter(delimiter, text_type, intraword=True):
+    default_inline_parser.register_delimiter(delimiter, text_type, intraword)
@@ -0,0 +1,70 @@
+import json, os
+
+FILE = "file"
+DIR = "dir"
+
+class FileEntry():
+    def __init__(self, path, size, mtime, kind=FILE):
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.kind = kind
+
+    def __eq__(self, other):
+        return (
+            self.path == other.path
+            and self.size == other.size
+            and self.mtime == other.mtime
+            and self.kind == other.kind
+        )
+
+    def __repr__(self):
+        return f"FileEntry({self.path}, {self.kind}, {self.size}, {self.mtime})"
+
+def scan(root, table=None):
+    # One scandir pass: DirEntry already knows whether it is a directory and
+    # caches its stat, so no path is stat'ed twice.
+    if table is None:
+        table = {}
+    with os.scandir(root) as entries:
+        for entry in sorted(entries, key=lambda entry: entry.name):
+            stat = entry.stat()
+            if entry.is_dir():
+                table[entry.path] = FileEntry(entry.path, 0, stat.st_mtime_ns, DIR)
+                scan(entry.path, table)
+            else:
+                table[entry.path] = FileEntry(entry.path, stat.st_size, stat.st_mtime_ns)
+    return table
+
+def stat_file(path):
+    stat = os.stat(path)
+    return FileEntry(path, stat.st_size, stat.st_mtime_ns)
+
+def changed_files(table, previous):
+    changed = []
+    for path, entry in table.items():
+        if entry.kind != FILE:
+            continue
+        old = previous.get(path)
+        if old is None or old != entry:
+            changed.append(path)
+    return changed
+
+def removed_files(table, previous):
+    return [path for path, entry in previous.items() if entry.kind == FILE and path not in table]
+
+def save_inventory(path, table, options=None):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    rows = [[entry.path, entry.size, entry.mtime, entry.kind] for entry in table.values()]
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"options": options, "files": rows}, f)
+    os.replace(tmp_path, path)
+
+def load_inventory(path):
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        return {row[0]: FileEntry(*row) for row in data["files"]}, data["options"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}, None
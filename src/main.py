@@ -1,74 +1,503 @@
-import os, shutil, sys
+import argparse, os, shutil, sys
+
+import metrics
 
 from pathlib import Path
+from time import perf_counter
 
-from transformers import markdown_to_html_node
-from helpers import extract_title
+from transformers import parse_page
+from frontmatter import split_front_matter
+from template import TemplateLoader
+from minify import Minifier
+from css import CSSIndex
+from astcache import ASTCache, PARSER_VERSION
+from output import DirectoryOutput, TarOutput, ZipOutput, ObjectStore, StoreOutput
+from inventory import FILE, scan, stat_file, changed_files, removed_files, save_inventory, load_inventory
+from discovery import PageDates, discover_pages, select_pages, published_pages
+from digest import ROOT, tree_digest, write_digest
+from buildlog import log, DEBUG, INFO, WARNING
+from sitemap import SitemapWriter, FeedWriter
+from errors import BuildError, MarkdownError
 
 static_dir = "./static"
 public_dir = "./docs"
 content_dir = "./content"
 template_loc = "./template.html"
+layouts_dir = "./layouts"
+stylesheet_loc = "./static/index.css"
+cache_dir = "./.cache/ast"
+inventory_path = "./.cache/inventory.json"
+site_url = "https://catxcult.github.io"
+site_title = "Tolkien Fan Club"
+feed_size = 20
+archive_formats = ("tar", "tar.gz", "zip")
 
-def copy_contents(from_dir, to_dir):
-    os.makedirs(to_dir, exist_ok=True)
-    for item in os.listdir(from_dir):
-        from_path = os.path.join(from_dir, item)
-        to_path = os.path.join(to_dir, item)
-        if os.path.isdir(from_path):
-            copy_contents(from_path, to_path)
-        else:
-            print(f"\tCopying {item} from {from_dir} -> {to_dir}")
-            shutil.copy(from_path, to_path)
+def copy_contents(from_dir, to_dir, output=None, skip=(), inventory=None):
+    # Copies the files scan() listed under from_dir; pass the build's table so
+    # the static directory is not walked again for every target.
+    if output is None:
+        output = DirectoryOutput(to_dir)
+        os.makedirs(to_dir, exist_ok=True)
+    if inventory is None:
+        inventory = scan(from_dir)
+    prefix = os.path.join(from_dir, "")
+    for path, entry in inventory.items():
+        if entry.kind != FILE or not path.startswith(prefix) or path in skip:
+            continue
+        to_path = os.path.join(to_dir, path[len(prefix):])
+        log.file_event("copied", "\tCopying {} -> {}", path, to_path, path=path)
+        output.copy(path, to_path)
+
+def update_contents(from_dir, to_dir, changed, removed):
+    for from_path in changed:
+        to_path = os.path.join(to_dir, os.path.relpath(from_path, from_dir))
+        log.file_event("copied", "\tCopying {} -> {}", from_path, to_path, path=from_path)
+        os.makedirs(os.path.dirname(to_path), exist_ok=True)
+        shutil.copy(from_path, to_path)
+    for from_path in removed:
+        to_path = os.path.join(to_dir, os.path.relpath(from_path, from_dir))
+        log.file_event("removed", "\tRemoving {}", to_path, path=to_path)
+        if os.path.exists(to_path):
+            os.remove(to_path)
+
+template_loader = TemplateLoader(layouts_dir)
+
+class Target():
+    # One output of a build: every page rendered for base_path with
+    # template_path into out_dir. All targets share one parse of each page.
+    def __init__(self, out_dir, base_path="/", template_path=template_loc):
+        self.out_dir = out_dir
+        self.base_path = base_path
+        self.template_path = template_path
+        self.sinks = []
+        self.output = DirectoryOutput(out_dir)
 
-def generate_page(from_path, template_path, dest_path, base_path):
-    print(f"Generating page from {from_path} to {dest_path} using {template_path}")
+    def __repr__(self):
+        return f"Target({self.out_dir}, {self.base_path}, {self.template_path})"
+
+def parse_target(spec):
+    out_dir, sep, rest = spec.partition("=")
+    base_path, _, template_path = rest.partition(":")
+    if not sep or not out_dir or not base_path.startswith("/") or not base_path.endswith("/"):
+        raise argparse.ArgumentTypeError(f"expected OUT_DIR=/BASE/PATH/[:TEMPLATE], got '{spec}'")
+    return Target(out_dir, base_path, template_path or template_loc)
+
+def generate_page(parsed, from_path, template_path, dest_path, base_path, fresh=False, minifier=None, css_index=None, output=None):
+    if output is None:
+        output = DirectoryOutput(os.path.dirname(dest_path))
+    if fresh and output.exists(dest_path):
+        log.file_event("kept", "Keeping {}, {} is unchanged", dest_path, from_path, path=from_path, dest=dest_path)
+        if css_index is not None:
+            _, state, front_matter = parsed
+            template = template_loader.load(page_template(template_path, front_matter, template_loader))
+            css_index.note(state.selectors | template.selectors(template_loader))
+        if metrics.active is not None:
+            metrics.active.counter("ssg_pages_kept_total").inc()
+        return
+    page = render_parsed(parsed, template_path, base_path, minifier=minifier, css_index=css_index)
+    output.write(dest_path, page)
+    log.file_event("rendered", "Generating page from {} to {} using {}", from_path, dest_path, template_path, path=from_path, dest=dest_path)
+    if metrics.active is not None:
+        metrics.active.counter("ssg_pages_rendered_total").inc()
+
+def parse_file(from_path, cache=None, base_path="/"):
     markdown_file = open(from_path, "r")
     markdown = markdown_file.read()
     markdown_file.close()
 
-    html = markdown_to_html_node(markdown).to_html()
-    title = extract_title(markdown)
-
-    template_file = open(template_path, "r")
-    template = template_file.read()
-    template_file.close()
-
-    template = template.replace("{{ Title }}", title)
-    template = template.replace("{{ Content }}", html)
-    href_rep = "href=\""
-    template = template.replace(f"{href_rep}/", f"{href_rep}{base_path}")
-    src_rep = "src=\""
-    template = template.replace(f"{src_rep}/", f"{src_rep}{base_path}")
-
-    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-    with open(dest_path, "w") as f:
-        f.write(template)
-
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, base_path):
-    for item in os.listdir(dir_path_content):
-        from_path = os.path.join(dir_path_content, item)
-        
-        if os.path.isdir(from_path):
-            to_path = os.path.join(dest_dir_path, item)
-            generate_pages_recursive(from_path, template_path, to_path, base_path)
-        elif item.endswith(".md"):
-            to_path = os.path.join(dest_dir_path, Path(item).with_suffix(".html"))
-            generate_page(from_path, template_path, to_path, base_path)
-
-def main():
-    basepath = "/"
-    if len(sys.argv) > 1:
-        basepath = sys.argv[1]
-    print(basepath)
-
-    if os.path.exists(public_dir):
-        print("Public Directory Found.. Deleting")
-        shutil.rmtree(public_dir)
-    print("Copying Static Files To Public Directory..")
-    copy_contents(static_dir, public_dir)
-    
-    generate_pages_recursive(content_dir, template_loc, public_dir, basepath)
+    front_matter, markdown = split_front_matter(markdown)
+    if cache is None:
+        root_node, state = parse_page(markdown, base_path=base_path)
+    else:
+        root_node, state = cache.parse_page(markdown, base_path)
+    return root_node, state, front_matter
+
+def page_context(root_node, state, front_matter, minifier=None):
+    def toc_html():
+        toc = state.toc_node()
+        return toc.to_html(minifier) if toc else ""
+
+    page = dict(front_matter)
+    page.update(
+        title=state.title,
+        description=state.description,
+        word_count=state.word_count,
+        first_image=state.first_image,
+        headings=[{"level": level, "text": text, "id": slug} for level, text, slug in state.headings.headings],
+    )
+    return {
+        "Title": state.title,
+        "Content": root_node.to_html(minifier),
+        "TOC": toc_html,
+        "page": page,
+        "site": {"title": site_title, "url": site_url},
+    }
+
+def page_template(template_path, front_matter, loader):
+    if "layout" in front_matter:
+        return os.path.join(loader.partials_dir, f"{front_matter['layout']}.html")
+    return template_path
+
+def render_page(from_path, template_path, base_path, cache=None, loader=None, minifier=None, css_index=None):
+    parsed = parse_file(from_path, cache, base_path)
+    return render_parsed(parsed, template_path, base_path, loader, minifier, css_index), parsed[1]
+
+def render_parsed(parsed, template_path, base_path, loader=None, minifier=None, css_index=None):
+    root_node, state, front_matter = parsed
+    if state.title is None:
+        raise Exception("Invalid/No Title found!")
+    if loader is None:
+        loader = template_loader
+    template = loader.load(page_template(template_path, front_matter, loader))
+
+    state.apply_base_path(base_path)
+    registry = metrics.active
+    start = perf_counter() if registry is not None else None
+    context = page_context(root_node, state, front_matter, minifier)
+    if start is not None:
+        serialized = perf_counter()
+        registry.counter("ssg_to_html_seconds_total").inc(serialized - start)
+    if css_index is not None:
+        used = state.selectors | template.selectors(loader)
+        if css_index.inline:
+            context["CriticalCSS"] = css_index.select(used)
+        else:
+            css_index.note(used)
+    page = template.render(context, loader, base_path, minifier)
+    if start is not None:
+        end = perf_counter()
+        registry.counter("ssg_template_seconds_total").inc(end - serialized)
+        registry.histogram("ssg_page_render_seconds").observe(end - start)
+        registry.histogram("ssg_page_nodes", metrics.NODE_BUCKETS).observe(metrics.count_nodes(root_node))
+    return page
+
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, base_path, sinks=None, errors=None, cache=None, unchanged=None, minifier=None, css_index=None):
+    target = Target(dest_dir_path, base_path, template_path)
+    if sinks:
+        target.sinks = sinks
+    generate_targets(dir_path_content, [target], errors=errors, cache=cache, unchanged=unchanged, minifier=minifier, css_index=css_index)
+
+def generate_targets(dir_path_content, targets, errors=None, cache=None, unchanged=None, minifier=None, css_index=None):
+    render_pages(discover_pages(dir_path_content), targets, errors, cache, unchanged, minifier, css_index)
+
+def section_templates(section, targets, layouts):
+    # A section layout (layouts/<section>.html) only stands in for the
+    # default template; a target given its own template keeps it.
+    layout = None
+    if section is not None:
+        if section not in layouts:
+            layout_path = os.path.join(layouts_dir, f"{section}.html")
+            layouts[section] = layout_path if os.path.exists(layout_path) else None
+        layout = layouts[section]
+    return [
+        layout if layout is not None and target.template_path == template_loc else target.template_path
+        for target in targets
+    ]
+
+def render_pages(pages, targets, errors=None, cache=None, unchanged=None, minifier=None, css_index=None, dates=None):
+    # Consumes a stream of PageSource, so callers can filter, sort or batch
+    # discover_pages() first; only the pages that reach here are parsed.
+    # Sitemap and feed records are dated by dates (a PageDates), else mtime.
+    layouts = {}
+    for source in pages:
+        from_path = source.source_path
+        templates = section_templates(source.section, targets, layouts)
+        fresh = unchanged is not None and from_path in unchanged
+        try:
+            parsed = parse_file(from_path, cache, targets[0].base_path)
+            for target, template_path in zip(targets, templates):
+                dest_path = os.path.join(target.out_dir, source.rel_path)
+                generate_page(parsed, from_path, template_path, dest_path, target.base_path, fresh, minifier, css_index, target.output)
+        except MarkdownError as e:
+            if metrics.active is not None:
+                metrics.active.counter("ssg_page_errors_total").inc()
+            if errors is None:
+                raise
+            errors.append(BuildError(from_path, e.message, e.line))
+            continue
+        except Exception as e:
+            if metrics.active is not None:
+                metrics.active.counter("ssg_page_errors_total").inc()
+            if errors is None:
+                raise
+            errors.append(BuildError(from_path, str(e)))
+            continue
+        _, state, front_matter = parsed
+        page_time = None
+        for target in targets:
+            if not target.sinks:
+                continue
+            if page_time is None:
+                page_time = source.mtime if dates is None else dates.time(source, front_matter)
+            record = state.to_record(from_path, os.path.join(target.out_dir, source.rel_path), source.url(target.base_path), page_time)
+            for sink in target.sinks:
+                sink.add(record)
+
+def remove_pages(pages, targets):
+    for page in pages:
+        for target in targets:
+            dest_path = os.path.join(target.out_dir, page.rel_path)
+            if target.output.exists(dest_path):
+                log.file_event("removed", "\tRemoving unpublished {}", dest_path, path=page.source_path, dest=dest_path)
+                os.remove(dest_path)
+
+def manifest_name(out_dir):
+    # The whole output path names the manifest, so a/docs and b/docs get
+    # a-docs.json and b-docs.json rather than one shared docs.json.
+    parts = [part for part in Path(os.path.normpath(out_dir)).parts if part not in (os.sep, ".", "..")]
+    return "-".join(parts) or "root"
+
+def open_output(out_dir, archive=None, store=None):
+    if archive == "zip":
+        return ZipOutput(out_dir, f"{out_dir}.zip")
+    if archive is not None:
+        return TarOutput(out_dir, f"{out_dir}.{archive}")
+    if store is not None:
+        return StoreOutput(out_dir, store, os.path.join(store.store_dir, "manifests", f"{manifest_name(out_dir)}.json"))
+    return DirectoryOutput(out_dir)
+
+def swap_into_place(staging_dir, target_dir):
+    # Two renames: the old tree is only removed once the new one is in place.
+    old_dir = f"{target_dir}.old"
+    if os.path.exists(old_dir):
+        shutil.rmtree(old_dir)
+    if os.path.exists(target_dir):
+        os.rename(target_dir, old_dir)
+    os.rename(staging_dir, target_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Build the static site into the public directory.")
+    parser.add_argument("basepath", nargs="?", help="URL prefix the site is served under")
+    parser.add_argument("--target", action="append", type=parse_target, metavar="OUT_DIR=/BASE/[:TEMPLATE]", help="render into OUT_DIR for base path /BASE/, optionally with its own template; repeat to build several targets from one parse")
+    parser.add_argument("--keep-going", action="store_true", help="render every page possible and report all errors at the end")
+    parser.add_argument("--staging", action="store_true", help="build into a staging directory and swap it in only on success")
+    parser.add_argument("--no-cache", action="store_true", help="always re-parse markdown instead of loading cached trees")
+    parser.add_argument("--minify", action="store_true", help="strip insignificant whitespace and attribute quotes from pages")
+    parser.add_argument("--inline-css", action="store_true", help="inline the stylesheet rules each page uses into its head")
+    parser.add_argument("--prune-css", action="store_true", help="drop stylesheet rules no page uses from the copied stylesheet")
+    parser.add_argument("--archive", choices=archive_formats, help="write each target as a single OUT_DIR.<format> archive instead of a directory; tar archives store repeated files once, zip archives do not")
+    parser.add_argument("--object-store", metavar="DIR", help="write output blobs into a content-addressed store in DIR with one path manifest per target")
+    parser.add_argument("--metrics", metavar="PATH", help="collect build metrics and write them to PATH, as JSON for .json and Prometheus text otherwise")
+    parser.add_argument("--quiet", action="store_true", help="only report warnings and errors")
+    parser.add_argument("--verbose", action="store_true", help="log every page rendered and file copied")
+    parser.add_argument("--log-format", choices=("text", "json"), default="text", help="write log lines as text or as JSON events")
+    parser.add_argument("--digest", action="store_true", help="write a Merkle digest of each output directory to OUT_DIR.digest")
+    parser.add_argument("--include", action="append", default=[], metavar="GLOB", help="only build pages whose content path matches GLOB (or lies under it); may be repeated")
+    parser.add_argument("--exclude", action="append", default=[], metavar="GLOB", help="skip pages whose content path matches GLOB (or lies under it); may be repeated")
+    parser.add_argument("--drafts", action="store_true", help="also build pages marked 'draft: true' in their front matter")
+    parser.add_argument("--future", action="store_true", help="also build pages whose front matter 'date' is after today")
+    parser.add_argument("--incremental", action="store_true", help="keep the previous output and only rewrite files whose sources changed")
+    args = parser.parse_args(argv)
+    if args.incremental and args.staging:
+        parser.error("--incremental updates the output in place and cannot be combined with --staging")
+    if args.digest and (args.archive or args.object_store):
+        parser.error("--digest covers output directories; object store manifests are already content-addressed")
+    if args.quiet and args.verbose:
+        parser.error("--quiet and --verbose cannot be combined")
+    if args.archive and args.object_store:
+        parser.error("--archive and --object-store are separate output modes")
+    if (args.archive or args.object_store) and (args.incremental or args.staging):
+        parser.error("--archive and --object-store write fresh output and cannot be combined with --incremental or --staging")
+    if args.object_store:
+        names = [manifest_name(target.out_dir) for target in args.target or ()]
+        if len(set(names)) != len(names):
+            parser.error(f"--target output directories must give distinct manifest names, got {', '.join(names)}")
+    if args.target and args.basepath is not None:
+        parser.error("give either a basepath or --target options, not both")
+    if not args.target:
+        args.target = [Target(public_dir, args.basepath or "/")]
+    return args
+
+def finish_metrics(registry, elapsed, rendered_before, cache=None):
+    rendered = registry.counter("ssg_pages_rendered_total").value - rendered_before
+    registry.gauge("ssg_build_seconds").set(elapsed)
+    registry.gauge("ssg_pages_per_second").set(rendered / elapsed if elapsed > 0 else 0)
+    if cache is not None and cache.hits + cache.misses:
+        registry.gauge("ssg_ast_cache_hit_ratio").set(cache.hits / (cache.hits + cache.misses))
+
+def main(argv=None, cache=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    log.configure(WARNING if args.quiet else DEBUG if args.verbose else INFO, args.log_format == "json")
+    try:
+        return build(args, cache)
+    finally:
+        log.finish()
+
+def build(args, cache=None):
+    started = perf_counter()
+    owns_metrics = args.metrics is not None and metrics.active is None
+    if owns_metrics:
+        metrics.enable()
+    rendered_before = metrics.active.counter("ssg_pages_rendered_total").value if metrics.active is not None else 0
+    targets = args.target
+    for target in targets:
+        log.info(target.base_path if len(targets) == 1 else f"{target.base_path} -> {target.out_dir}", "target", base_path=target.base_path, out_dir=target.out_dir)
+
+    packed = args.archive is not None or args.object_store is not None
+    store = ObjectStore(args.object_store) if args.object_store else None
+    out_dirs = [f"{target.out_dir}.staging" if args.staging else target.out_dir for target in targets]
+    inventory = scan(static_dir)
+    scan(content_dir, inventory)
+    for target in targets:
+        inventory[target.template_path] = stat_file(target.template_path)
+    if os.path.isdir(layouts_dir):
+        scan(layouts_dir, inventory)
+    options = {
+        "targets": [[target.out_dir, target.base_path, target.template_path] for target in targets],
+        "parser_version": PARSER_VERSION,
+        "minify": args.minify,
+        "inline_css": args.inline_css,
+        "prune_css": args.prune_css,
+        "archive": args.archive,
+        "object_store": args.object_store,
+    }
+    previous = {}
+    if args.incremental and all(os.path.exists(out_dir) for out_dir in out_dirs):
+        previous, previous_options = load_inventory(inventory_path)
+        if previous_options != options:
+            previous = {}
+
+    layouts_prefix = os.path.join(layouts_dir, "")
+    template_paths = {target.template_path for target in targets}
+    if args.inline_css:
+        # Every page embeds rules from the stylesheet.
+        template_paths.add(stylesheet_loc)
+    def is_template(path):
+        return path in template_paths or path.startswith(layouts_prefix)
+
+    unchanged = None
+    templates_changed = False
+    if previous:
+        changed = changed_files(inventory, previous)
+        removed = removed_files(inventory, previous)
+        log.info(f"Incremental Build: {len(changed)} changed, {len(removed)} removed..", "incremental", changed=len(changed), removed=len(removed))
+        static_prefix = os.path.join(static_dir, "")
+        for out_dir in out_dirs:
+            update_contents(
+                static_dir, out_dir,
+                [path for path in changed if path.startswith(static_prefix)],
+                [path for path in removed if path.startswith(static_prefix)],
+            )
+            for path in removed:
+                if path.endswith(".md"):
+                    dest_path = Path(out_dir, os.path.relpath(path, content_dir)).with_suffix(".html")
+                    if dest_path.exists():
+                        dest_path.unlink()
+        templates_changed = any(is_template(path) for path in changed + removed)
+        if not templates_changed:
+            unchanged = set(inventory).difference(changed)
+    elif not packed:
+        for out_dir in out_dirs:
+            if os.path.exists(out_dir):
+                log.info(f"Output Directory {out_dir} Found.. Deleting")
+                shutil.rmtree(out_dir)
+            log.info(f"Copying Static Files To {out_dir}..")
+            copy_contents(static_dir, out_dir, inventory=inventory)
+
+    # A partial build on top of previous output only touches the pages it
+    # selects; sitemaps, feeds and the pruned stylesheet describe the whole
+    # site, so the existing ones are kept.
+    partial = bool(args.include or args.exclude) and bool(previous)
+    build_targets = []
+    for target, out_dir in zip(targets, out_dirs):
+        build_target = Target(out_dir, target.base_path, target.template_path)
+        output = build_target.output = open_output(out_dir, args.archive, store)
+        build_targets.append(build_target)
+        if partial:
+            continue
+        build_target.sinks = [
+            SitemapWriter(out_dir, site_url, target.base_path, output=output),
+            FeedWriter(os.path.join(out_dir, "feed.xml"), site_url, site_title, f"{target.base_path}blog/", feed_size, "rss", output),
+            FeedWriter(os.path.join(out_dir, "atom.xml"), site_url, site_title, f"{target.base_path}blog/", feed_size, "atom", output),
+        ]
+    errors = [] if args.keep_going else None
+    if args.no_cache:
+        cache = None
+    elif cache is None:
+        cache = ASTCache(cache_dir)
+    minifier = Minifier() if args.minify else None
+    css_index = None
+    if args.inline_css or args.prune_css:
+        with open(stylesheet_loc) as f:
+            css_index = CSSIndex(f.read(), args.inline_css)
+    skipped = []
+    unpublished = []
+    pages = select_pages(discover_pages(content_dir, inventory), args.include, args.exclude, skipped)
+    pages = published_pages(pages, args.drafts, args.future, rejected=unpublished)
+    render_pages(pages, build_targets, errors, cache, unchanged, minifier, css_index, PageDates(content_dir))
+    remove_pages(unpublished, build_targets)
+    # Pages that were not rebuilt still reflect the previous sources and
+    # templates, so the next incremental build must still see those changes.
+    stale = [page.source_path for page in skipped]
+    if partial and templates_changed:
+        stale.extend(path for path in set(inventory) | set(previous) if is_template(path))
+    for path in stale:
+        if path in previous:
+            inventory[path] = previous[path]
+        else:
+            inventory.pop(path, None)
+    if partial:
+        log.info(f"Partial Build: {len(skipped)} page(s) not selected, keeping sitemaps and feeds..", "partial", skipped=len(skipped))
+    else:
+        log.info("Writing Sitemap and Feeds..")
+    for target in build_targets:
+        for sink in target.sinks:
+            sink.close()
+    if packed:
+        # Archives and manifests take each path once, so the static files are
+        # added last, with the stylesheet left to the pruning step.
+        skip = {stylesheet_loc} if args.prune_css else ()
+        log.info("Copying Static Files To Output..")
+        for target in build_targets:
+            copy_contents(static_dir, target.out_dir, target.output, skip, inventory)
+    if args.prune_css and not partial:
+        pruned = css_index.prune()
+        for target in build_targets:
+            target.output.write(os.path.join(target.out_dir, os.path.relpath(stylesheet_loc, static_dir)), pruned)
+        log.info(f"Pruned stylesheet: {os.path.getsize(stylesheet_loc)} -> {len(pruned.encode())} bytes", "prune_css", before=os.path.getsize(stylesheet_loc), after=len(pruned.encode()))
+    for target in build_targets:
+        target.output.close()
+    if args.archive is not None:
+        for target in build_targets:
+            output = target.output
+            if isinstance(output, TarOutput):
+                log.info(f"Wrote {output.archive_path}, {output.saved} duplicate bytes deduplicated", "archive", path=output.archive_path, saved=output.saved)
+            else:
+                log.info(f"Wrote {output.archive_path}", "archive", path=output.archive_path)
+    if store is not None:
+        log.info(f"Object store: {len(store.new)} new blob(s), {store.reused} reused", "object_store", new=len(store.new), reused=store.reused)
+    if cache is not None:
+        log.info(f"Parse cache: {cache.hits} hit(s), {cache.misses} miss(es)", "cache", hits=cache.hits, misses=cache.misses)
+    if minifier is not None:
+        log.info(f"Minify: saved {minifier.saved} bytes", "minify", saved=minifier.saved)
+    if metrics.active is not None:
+        finish_metrics(metrics.active, perf_counter() - started, rendered_before, cache)
+        if args.metrics is not None:
+            metrics.active.write(args.metrics)
+            log.info(f"Wrote metrics to {args.metrics}", "metrics", path=args.metrics)
+        if owns_metrics:
+            metrics.disable()
+
+    if errors:
+        log.error(f"Build failed: {len(errors)} page(s) had errors", "build_failed", errors=len(errors))
+        for error in errors:
+            log.error(f"\t{error}", "page_error", path=error.path, line=error.line, error=error.message)
+        if args.staging:
+            log.error(f"Leaving {', '.join(target.out_dir for target in targets)} untouched, partial output is in {', '.join(out_dirs)}")
+        return 1
+
+    if args.staging:
+        for target, out_dir in zip(targets, out_dirs):
+            log.info(f"Swapping {out_dir} Into {target.out_dir}..")
+            swap_into_place(out_dir, target.out_dir)
+    if args.digest:
+        for target in targets:
+            digests = tree_digest(target.out_dir)
+            write_digest(f"{target.out_dir}.digest", digests)
+            log.info(f"Digest of {target.out_dir}: {digests[ROOT]}", "digest", out_dir=target.out_dir, digest=digests[ROOT])
+    save_inventory(inventory_path, inventory, options)
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,140 @@
+import json, os
+
+from bisect import bisect_left
+
+# Hot paths check `metrics.active is not None` before doing any work, so a
+# build without a registry pays one attribute lookup per instrumented call.
+active = None
+
+HELP = {
+    "ssg_pages_rendered_total": "Pages rendered and written, per target.",
+    "ssg_pages_kept_total": "Pages left in place because their source was unchanged.",
+    "ssg_page_errors_total": "Pages that failed to build.",
+    "ssg_ast_cache_hits_total": "Parsed trees loaded from the AST cache.",
+    "ssg_ast_cache_misses_total": "Markdown files parsed because no cached tree existed.",
+    "ssg_ast_cache_hit_ratio": "AST cache hits over lookups for the last build.",
+    "ssg_output_bytes_total": "Bytes of pages and static files written to the output.",
+    "ssg_output_files_total": "Pages and static files written to the output.",
+    "ssg_page_nodes": "HTML nodes per rendered page tree.",
+    "ssg_page_render_seconds": "Time to render one page for one target, template included.",
+    "ssg_block_parse_seconds_total": "Time spent in markdown_to_html_node, inline parsing included.",
+    "ssg_inline_parse_seconds_total": "Time spent in text_to_textnodes.",
+    "ssg_to_html_seconds_total": "Time spent serializing page trees with to_html.",
+    "ssg_template_seconds_total": "Time spent rendering page templates.",
+    "ssg_build_seconds": "Wall time of the last build.",
+    "ssg_pages_per_second": "Pages rendered per second in the last build.",
+}
+
+NODE_BUCKETS = (10, 50, 100, 500, 1000, 5000, 10000, 50000)
+SECONDS_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+class Counter():
+    kind = "counter"
+
+    def __init__(self, name):
+        self.name = name
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def to_data(self):
+        return self.value
+
+    def samples(self):
+        return [(self.name, self.value)]
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value):
+        self.value = value
+
+class Histogram():
+    kind = "histogram"
+
+    def __init__(self, name, buckets):
+        self.name = name
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            total += count
+            yield bound, total
+
+    def to_data(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": {str(bound): total for bound, total in self.cumulative()},
+        }
+
+    def samples(self):
+        samples = [(f'{self.name}_bucket{{le="{bound}"}}', total) for bound, total in self.cumulative()]
+        samples.append((f"{self.name}_sum", self.sum))
+        samples.append((f"{self.name}_count", self.count))
+        return samples
+
+class MetricsRegistry():
+    def __init__(self):
+        self.metrics = {}
+
+    def get(self, name, factory):
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = factory()
+        return metric
+
+    def counter(self, name):
+        return self.get(name, lambda: Counter(name))
+
+    def gauge(self, name):
+        return self.get(name, lambda: Gauge(name))
+
+    def histogram(self, name, buckets=SECONDS_BUCKETS):
+        return self.get(name, lambda: Histogram(name, buckets))
+
+    def to_prometheus(self):
+        lines = []
+        for name in sorted(self.metrics):
+            metric = self.metrics[name]
+            if name in HELP:
+                lines.append(f"# HELP {name} {HELP[name]}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for sample, value in metric.samples():
+                lines.append(f"{sample} {value}")
+        return "\n".join(lines) + "\n"
+
+    def to_json(self):
+        return json.dumps({name: self.metrics[name].to_data() for name in sorted(self.metrics)}, indent=1)
+
+    def write(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            f.write(self.to_json() if path.endswith(".json") else self.to_prometheus())
+
+def enable(registry=None):
+    global active
+    active = registry if registry is not None else MetricsRegistry()
+    return active
+
+def disable():
+    global active
+    active = None
+
+def count_nodes(node):
+    count = 1
+    for child in getattr(node, "children", None) or ():
+        count += count_nodes(child)
+    return count
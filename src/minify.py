@@ -0,0 +1,48 @@
+import re
+
+WHITESPACE = re.compile(r"\s+")
+PRESERVE = re.compile(r"<(pre|code|textarea|script|style)\b.*?</\1\s*>", re.DOTALL | re.IGNORECASE)
+COMMENT = re.compile(r"<!--(?!\[if).*?-->", re.DOTALL)
+BLOCK_TAG = re.compile(
+    r"\s*(</?(?:!doctype|html|head|body|meta|link|title|base|article|aside|section|nav|header|footer|main"
+    r"|div|p|ul|ol|li|h[1-6]|blockquote|pre|table|thead|tbody|tr|td|th|hr|br|form|figure)\b[^>]*>)\s*",
+    re.IGNORECASE,
+)
+TAG = re.compile(r"<[a-zA-Z][^>]*>")
+QUOTED_ATTRIBUTE = re.compile(r"(\s[\w:-]+)=\"([^\s\"'=<>`]+)\"")
+UNQUOTED_VALUE = re.compile(r"[^\s\"'=<>`]+$")
+
+class Minifier():
+    # Passed down the serializers (HTMLNode.to_html, Template.render) to drop
+    # insignificant whitespace and attribute quotes as the HTML is produced.
+    # Anything under <pre> or <code> is left exactly as written. saved counts
+    # the bytes removed so far.
+    def __init__(self):
+        self.saved = 0
+
+    def text(self, value):
+        collapsed = WHITESPACE.sub(" ", value)
+        self.saved += len(value) - len(collapsed)
+        return collapsed
+
+    def attribute(self, name, value):
+        if value and UNQUOTED_VALUE.match(value):
+            self.saved += 2
+            return f" {name}={value}"
+        return f" {name}=\"{value}\""
+
+def minify_markup(html):
+    parts = []
+    pos = 0
+    for match in PRESERVE.finditer(html):
+        parts.append(minify_fragment(html[pos:match.start()]))
+        parts.append(match[0])
+        pos = match.end()
+    parts.append(minify_fragment(html[pos:]))
+    return "".join(parts)
+
+def minify_fragment(html):
+    html = COMMENT.sub("", html)
+    html = WHITESPACE.sub(" ", html)
+    html = BLOCK_TAG.sub(r"\1", html)
+    return TAG.sub(lambda match: QUOTED_ATTRIBUTE.sub(r"\1=\2", match[0]), html)
@@ -0,0 +1,172 @@
+import hashlib, io, json, os, shutil, tarfile, zipfile
+
+import metrics
+
+from pathlib import Path
+
+# Outputs take the same paths the build always used (out_dir/blog/index.html);
+# archive and store outputs map them to names relative to their root, so
+# pages, static files, sitemaps and feeds never touch an intermediate tree.
+
+def note_written(size):
+    if metrics.active is None:
+        return
+    metrics.active.counter("ssg_output_files_total").inc()
+    metrics.active.counter("ssg_output_bytes_total").inc(size)
+
+class DirectoryOutput():
+    def __init__(self, root):
+        self.root = root
+
+    def open(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return open(path, "w")
+
+    def write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb" if isinstance(data, bytes) else "w") as f:
+            f.write(data)
+        if metrics.active is not None:
+            note_written(len(data if isinstance(data, bytes) else data.encode()))
+
+    def copy(self, from_path, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.copy(from_path, path)
+        if metrics.active is not None:
+            note_written(os.path.getsize(path))
+
+    def exists(self, path):
+        return os.path.exists(path)
+
+    def close(self):
+        pass
+
+class MemberFile(io.StringIO):
+    def __init__(self, output, path):
+        super().__init__()
+        self.output = output
+        self.path = path
+
+    def close(self):
+        if not self.closed:
+            self.output.write(self.path, self.getvalue())
+        super().close()
+
+class PackedOutput():
+    # Base for outputs that are not a directory tree. Each member is written
+    # once, so pages are never "kept" from a previous build.
+    def __init__(self, root):
+        self.root = root
+        self.digests = {}
+        self.saved = 0
+
+    def name(self, path):
+        return Path(os.path.relpath(path, self.root)).as_posix()
+
+    def open(self, path):
+        return MemberFile(self, path)
+
+    def write(self, path, data):
+        if isinstance(data, str):
+            data = data.encode()
+        name = self.name(path)
+        digest = hashlib.sha256(data).hexdigest()
+        first = self.digests.setdefault(digest, name)
+        note_written(len(data))
+        self.add(name, data, digest, first)
+
+    def copy(self, from_path, path):
+        with open(from_path, "rb") as f:
+            self.write(path, f.read())
+
+    def exists(self, path):
+        return False
+
+class TarOutput(PackedOutput):
+    # Streams members into a (optionally gzipped) tar file. Repeated content
+    # is stored once and later copies become hard links to the first member.
+    def __init__(self, root, archive_path):
+        super().__init__(root)
+        self.archive_path = archive_path
+        os.makedirs(os.path.dirname(archive_path) or ".", exist_ok=True)
+        self.file = tarfile.open(archive_path, "w|gz" if archive_path.endswith(".gz") else "w|")
+
+    def add(self, name, data, digest, first):
+        info = tarfile.TarInfo(name)
+        info.mode = 0o644
+        if first != name:
+            info.type = tarfile.LNKTYPE
+            info.linkname = first
+            self.file.addfile(info)
+            self.saved += len(data)
+            return
+        info.size = len(data)
+        self.file.addfile(info, io.BytesIO(data))
+
+    def close(self):
+        self.file.close()
+
+class ZipOutput(PackedOutput):
+    # Zip has no portable hard links, so repeated content is stored in full
+    # and saved stays 0; use a tar archive or the object store to deduplicate.
+    def __init__(self, root, archive_path):
+        super().__init__(root)
+        self.archive_path = archive_path
+        os.makedirs(os.path.dirname(archive_path) or ".", exist_ok=True)
+        self.file = zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED)
+
+    def add(self, name, data, digest, first):
+        self.file.writestr(zipfile.ZipInfo(name), data, zipfile.ZIP_DEFLATED)
+
+    def close(self):
+        self.file.close()
+
+class ObjectStore():
+    # Content-addressed blobs under store_dir/objects/<2>/<sha256>, shared by
+    # every build and target: a blob already in the store is never rewritten,
+    # so only the digests listed as "new" in a manifest need uploading.
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        self.new = []
+        self.reused = 0
+
+    def blob_path(self, digest):
+        return os.path.join(self.store_dir, "objects", digest[:2], digest)
+
+    def put(self, data, digest):
+        path = self.blob_path(digest)
+        if os.path.exists(path):
+            self.reused += 1
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self.new.append(digest)
+        return True
+
+class StoreOutput(PackedOutput):
+    # Writes blobs into an ObjectStore and, on close, the path -> digest
+    # manifest for this output to manifest_path.
+    def __init__(self, root, store, manifest_path):
+        super().__init__(root)
+        self.store = store
+        self.manifest_path = manifest_path
+        self.files = {}
+        self.new = []
+
+    def add(self, name, data, digest, first):
+        self.files[name] = digest
+        if first != name:
+            self.saved += len(data)
+            return
+        if self.store.put(data, digest):
+            self.new.append(digest)
+
+    def close(self):
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"files": self.files, "new": self.new}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
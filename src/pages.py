@@ -0,0 +1,83 @@
+from blocks import default_block_registry
+from toc import HeadingIndex
+from urls import is_root_relative, rewrite_url
+
+class PageRecord():
+    def __init__(self, source_path, dest_path, url, mtime, title=None, description=None, word_count=0, first_image=None):
+        self.source_path = source_path
+        self.dest_path = dest_path
+        self.url = url
+        self.mtime = mtime
+        self.title = title
+        self.description = description
+        self.word_count = word_count
+        self.first_image = first_image
+
+    def __eq__(self, other):
+        return (
+            self.source_path == other.source_path
+            and self.dest_path == other.dest_path
+            and self.url == other.url
+            and self.mtime == other.mtime
+            and self.title == other.title
+            and self.description == other.description
+            and self.word_count == other.word_count
+            and self.first_image == other.first_image
+        )
+
+    def __repr__(self):
+        return f"PageRecord({self.url}, {self.title}, {self.source_path})"
+
+class ParseState():
+    # Per-page state filled in while markdown_to_html_node builds the tree. The
+    # page metadata (title, description, word count, first image) is captured
+    # here as the blocks are rendered, so nothing re-reads the markdown.
+    #
+    # Root-relative link and image URLs are rewritten for base_path as their
+    # nodes are built, and the props holding them are remembered so the same
+    # tree can be retargeted to another base path in O(links).
+    def __init__(self, registry=default_block_registry, base_path="/", max_nesting=32):
+        self.registry = registry
+        self.base_path = base_path
+        self.max_nesting = max_nesting
+        self.depth = 0
+        self.links = []
+        self.selectors = set()
+        self.headings = HeadingIndex()
+        self.title = None
+        self.description = None
+        self.word_count = 0
+        self.first_image = None
+
+    def note_node(self, node):
+        # Block renderers' top-level nodes are recorded here by render_block;
+        # a renderer that builds nested tagged nodes adds their selectors too.
+        if node.tag is not None:
+            self.selectors.add(node.tag)
+        if node.props:
+            for name in node.props.get("class", "").split():
+                self.selectors.add(f".{name}")
+            if "id" in node.props:
+                self.selectors.add(f"#{node.props['id']}")
+
+    def add_link(self, props, key):
+        url = props[key]
+        if is_root_relative(url):
+            self.links.append((props, key, url))
+            props[key] = rewrite_url(url, self.base_path)
+
+    def apply_base_path(self, base_path):
+        if base_path == self.base_path:
+            return
+        for props, key, url in self.links:
+            props[key] = rewrite_url(url, base_path)
+        self.base_path = base_path
+
+    def toc_node(self):
+        return self.headings.to_html_node()
+
+    def to_record(self, source_path, dest_path, url, mtime):
+        return PageRecord(
+            source_path, dest_path, url, mtime,
+            self.title, self.description, self.word_count, self.first_image,
+        )
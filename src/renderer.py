@@ -0,0 +1,40 @@
+from blocks import default_block_registry
+from errors import LimitError
+from minify import Minifier
+from pages import ParseState
+from transformers import markdown_to_html_node
+
+# The in-process API for embedding the converter, e.g. rendering previews:
+#
+#     from renderer import RenderOptions, render
+#     html = render(markdown, RenderOptions(max_input_size=64_000, base_path="/docs/"))
+#
+# Parsing is a single pass over the blocks and a delimiter stack over the
+# inline text, so time grows linearly with the input. max_input_size bounds
+# the input (LimitError beyond it); max_nesting bounds how deeply quotes,
+# lists and emphasis nest, anything deeper is rendered as plain text.
+class RenderOptions():
+    def __init__(self, max_input_size=1_000_000, max_nesting=32, base_path="/", minify=False, registry=default_block_registry):
+        self.max_input_size = max_input_size
+        self.max_nesting = max_nesting
+        self.base_path = base_path
+        self.minify = minify
+        self.registry = registry
+
+default_render_options = RenderOptions()
+
+def render(markdown, options=None):
+    root_node, _ = render_tree(markdown, options)
+    if not root_node.children:
+        return f"<{root_node.tag}></{root_node.tag}>"
+    minifier = Minifier() if options is not None and options.minify else None
+    return root_node.to_html(minifier)
+
+def render_tree(markdown, options=None):
+    if options is None:
+        options = default_render_options
+    if len(markdown) > options.max_input_size:
+        raise LimitError(f"Input of {len(markdown)} characters exceeds the limit of {options.max_input_size}")
+    state = ParseState(options.registry, options.base_path, options.max_nesting)
+    root_node = markdown_to_html_node(markdown, options.registry, state)
+    return root_node, state
@@ -0,0 +1,134 @@
+import heapq, os
+
+from datetime import datetime, timezone
+from email.utils import formatdate
+from xml.sax.saxutils import escape
+
+from output import DirectoryOutput
+
+SITEMAP_MAX_URLS = 50000
+ATTR_ENTITIES = {"\"": "&quot;"}
+
+def iso_date(mtime):
+    return datetime.fromtimestamp(mtime, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+class SitemapWriter():
+    # Streams <url> entries into sitemap-N.xml parts as pages are generated,
+    # rolling over every max_urls entries, then writes sitemap.xml as the index.
+    def __init__(self, out_dir, site_url, base_path="/", max_urls=SITEMAP_MAX_URLS, output=None):
+        self.out_dir = out_dir
+        self.output = output if output is not None else DirectoryOutput(out_dir)
+        self.site_url = site_url.rstrip("/")
+        self.base_path = base_path
+        self.max_urls = max_urls
+        self.parts = []
+        self.file = None
+        self.count = 0
+
+    def add(self, record):
+        if self.file is None or self.count >= self.max_urls:
+            self._start_part()
+        loc = escape(self.site_url + record.url)
+        self.file.write(f"  <url><loc>{loc}</loc><lastmod>{iso_date(record.mtime)}</lastmod></url>\n")
+        self.count += 1
+
+    def close(self):
+        self._end_part()
+        with self.output.open(os.path.join(self.out_dir, "sitemap.xml")) as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            f.write('<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+            for name in self.parts:
+                loc = escape(f"{self.site_url}{self.base_path}{name}")
+                f.write(f"  <sitemap><loc>{loc}</loc></sitemap>\n")
+            f.write("</sitemapindex>\n")
+        return self.parts
+
+    def _start_part(self):
+        self._end_part()
+        name = f"sitemap-{len(self.parts) + 1}.xml"
+        self.parts.append(name)
+        self.file = self.output.open(os.path.join(self.out_dir, name))
+        self.file.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        self.file.write('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+        self.count = 0
+
+    def _end_part(self):
+        if self.file is None:
+            return
+        self.file.write("</urlset>\n")
+        self.file.close()
+        self.file = None
+
+class FeedWriter():
+    # Keeps only the newest `limit` posts in a min-heap while pages stream past,
+    # so memory and work stay O(limit) rather than sorting every page.
+    def __init__(self, path, site_url, title, prefix="/", limit=20, feed_format="rss", output=None):
+        if feed_format not in ("rss", "atom"):
+            raise ValueError(f"Unknown feed format: '{feed_format}'")
+        self.path = path
+        self.output = output if output is not None else DirectoryOutput(os.path.dirname(path))
+        self.site_url = site_url.rstrip("/")
+        self.title = title
+        self.prefix = prefix
+        self.limit = limit
+        self.feed_format = feed_format
+        self.heap = []
+        self.seq = 0
+
+    def add(self, record):
+        if record.url == self.prefix or not record.url.startswith(self.prefix):
+            return
+        self.seq += 1
+        entry = (record.mtime, self.seq, record)
+        if len(self.heap) < self.limit:
+            heapq.heappush(self.heap, entry)
+        else:
+            heapq.heappushpop(self.heap, entry)
+
+    def newest(self):
+        return [entry[2] for entry in sorted(self.heap, reverse=True)]
+
+    def close(self):
+        records = self.newest()
+        with self.output.open(self.path) as f:
+            if self.feed_format == "rss":
+                self._write_rss(f, records)
+            else:
+                self._write_atom(f, records)
+        return records
+
+    def _write_rss(self, f, records):
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write('<rss version="2.0"><channel>\n')
+        f.write(f"  <title>{escape(self.title)}</title>\n")
+        f.write(f"  <link>{escape(self.site_url + self.prefix)}</link>\n")
+        f.write(f"  <description>{escape(self.title)}</description>\n")
+        for record in records:
+            link = escape(self.site_url + record.url)
+            f.write("  <item>")
+            f.write(f"<title>{escape(record.title or record.url)}</title>")
+            f.write(f"<link>{link}</link><guid>{link}</guid>")
+            if record.description:
+                f.write(f"<description>{escape(record.description)}</description>")
+            f.write(f"<pubDate>{formatdate(record.mtime, usegmt=True)}</pubDate>")
+            f.write("</item>\n")
+        f.write("</channel></rss>\n")
+
+    def _write_atom(self, f, records):
+        updated = iso_date(records[0].mtime) if records else iso_date(0)
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write('<feed xmlns="http://www.w3.org/2005/Atom">\n')
+        f.write(f"  <title>{escape(self.title)}</title>\n")
+        f.write(f"  <id>{escape(self.site_url + self.prefix)}</id>\n")
+        f.write(f'  <link href="{escape(self.site_url + self.prefix, ATTR_ENTITIES)}" />\n')
+        f.write(f"  <updated>{updated}</updated>\n")
+        for record in records:
+            link = escape(self.site_url + record.url, ATTR_ENTITIES)
+            f.write("  <entry>")
+            f.write(f"<title>{escape(record.title or record.url)}</title>")
+            f.write(f'<link href="{link}" /><id>{link}</id>')
+            f.write(f"<updated>{iso_date(record.mtime)}</updated>")
+            if record.description:
+                f.write(f"<summary>{escape(record.description)}</summary>")
+            f.write("</entry>\n")
+        f.write("</feed>\n")
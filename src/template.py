@@ -0,0 +1,216 @@
+import hashlib, os, re
+
+from errors import TemplateError
+from css import markup_selectors
+from minify import minify_markup
+from urls import rewrite_attributes
+
+TAG_PATTERN = re.compile(r"\{\{\s*(.*?)\s*\}\}|\{%\s*(.*?)\s*%\}", re.DOTALL)
+FOR_PATTERN = re.compile(r"for\s+(\w+)\s+in\s+([\w.]+)$")
+IF_PATTERN = re.compile(r"if\s+(not\s+)?([\w.]+)$")
+INCLUDE_PATTERN = re.compile(r"include\s+\"([^\"]+)\"$")
+NAME_PATTERN = re.compile(r"[\w.]+$")
+
+VAR = 0
+FOR = 1
+IF = 2
+INCLUDE = 3
+LITERAL = 4
+
+class Template():
+    # A template is compiled once into a list of segments: literal strings and
+    # (kind, ...) tuples for variables, loops, conditionals and includes.
+    # Rendering walks the segments appending to one list, so a page (includes
+    # and all) is produced by a single join. Root-relative href/src attributes
+    # in the literal segments are rewritten, and minified if asked, once per
+    # variant and kept.
+    def __init__(self, source, name="<template>"):
+        self.name = name
+        self.segments = compile_template(source, name)
+        self.variants = {("/", False): self.segments}
+        self.markup = None
+        self.includes = None
+
+    def render(self, context, loader=None, base_path="/", minifier=None):
+        parts = []
+        self.render_into(parts, context, loader, base_path, minifier)
+        return "".join(parts)
+
+    def render_into(self, parts, context, loader=None, base_path="/", minifier=None):
+        key = (base_path, minifier is not None)
+        segments = self.variants.get(key)
+        if segments is None:
+            segments = rebase_segments(self.segments, base_path, key[1])
+            self.variants[key] = segments
+        render_segments(segments, parts, context, loader, self.name, base_path, minifier)
+
+    def selectors(self, loader=None):
+        # Tags, classes and ids written into the template and its partials.
+        if self.markup is None:
+            literals = []
+            self.includes = []
+            collect_markup(self.segments, literals, self.includes)
+            self.markup = markup_selectors("".join(literals))
+        used = set(self.markup)
+        if loader is not None:
+            for name in self.includes:
+                used |= loader.include(name).selectors(loader)
+        return used
+
+class TemplateLoader():
+    # Compiled templates cached by path; a file whose mtime moved is re-read
+    # but only recompiled when its sha1 actually changed.
+    def __init__(self, partials_dir="."):
+        self.partials_dir = partials_dir
+        self.templates = {}
+        self.compiles = 0
+
+    def load(self, path):
+        mtime = os.stat(path).st_mtime_ns
+        cached = self.templates.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[2]
+        with open(path, "r") as f:
+            source = f.read()
+        digest = hashlib.sha1(source.encode()).digest()
+        if cached is not None and cached[1] == digest:
+            template = cached[2]
+        else:
+            template = Template(source, path)
+            self.compiles += 1
+        self.templates[path] = (mtime, digest, template)
+        return template
+
+    def include(self, name):
+        return self.load(os.path.join(self.partials_dir, name))
+
+def collect_markup(segments, literals, includes):
+    for segment in segments:
+        if type(segment) is str:
+            literals.append(segment)
+        elif segment[0] == FOR:
+            collect_markup(segment[3], literals, includes)
+        elif segment[0] == IF:
+            collect_markup(segment[3], literals, includes)
+            collect_markup(segment[4], literals, includes)
+        elif segment[0] == INCLUDE:
+            includes.append(segment[1])
+
+def compile_template(source, name="<template>"):
+    root = []
+    stack = [("root", root, 1)]
+    pos = 0
+    for match in TAG_PATTERN.finditer(source):
+        segments = stack[-1][1]
+        if match.start() > pos:
+            segments.append(source[pos:match.start()])
+        pos = match.end()
+        line = source.count("\n", 0, match.start()) + 1
+        if match[1] is not None:
+            if not NAME_PATTERN.match(match[1]):
+                raise TemplateError(f"Invalid expression: '{match[1]}'", name, line)
+            segments.append((VAR, tuple(match[1].split("."))))
+            continue
+
+        tag = match[2]
+        keyword = tag.split(None, 1)[0] if tag else ""
+        if keyword == "for":
+            loop = FOR_PATTERN.match(tag)
+            if loop is None:
+                raise TemplateError(f"Invalid for tag: '{tag}'", name, line)
+            body = []
+            segments.append((FOR, loop[1], tuple(loop[2].split(".")), body))
+            stack.append(("for", body, line))
+        elif keyword == "if":
+            condition = IF_PATTERN.match(tag)
+            if condition is None:
+                raise TemplateError(f"Invalid if tag: '{tag}'", name, line)
+            body = []
+            segments.append((IF, tuple(condition[2].split(".")), condition[1] is not None, body, []))
+            stack.append(("if", body, line))
+        elif keyword == "else":
+            if stack[-1][0] != "if":
+                raise TemplateError("'else' outside of an if block", name, line)
+            stack[-1] = ("else", stack[-2][1][-1][4], stack[-1][2])
+        elif keyword in ("endfor", "endif"):
+            if stack[-1][0] not in (("for",) if keyword == "endfor" else ("if", "else")):
+                raise TemplateError(f"Unexpected '{keyword}'", name, line)
+            stack.pop()
+        elif keyword == "include":
+            include = INCLUDE_PATTERN.match(tag)
+            if include is None:
+                raise TemplateError(f"Invalid include tag: '{tag}'", name, line)
+            segments.append((INCLUDE, include[1]))
+        else:
+            raise TemplateError(f"Unknown tag: '{tag}'", name, line)
+
+    if len(stack) > 1:
+        raise TemplateError(f"Unclosed '{stack[-1][0]}' block", name, stack[-1][2])
+    if pos < len(source):
+        root.append(source[pos:])
+    return root
+
+def rebase_segments(segments, base_path, minify=False):
+    rebased = []
+    for segment in segments:
+        if type(segment) is str:
+            literal = rewrite_attributes(segment, base_path)
+            if minify:
+                minified = minify_markup(literal)
+                rebased.append((LITERAL, minified, len(literal) - len(minified)))
+            else:
+                rebased.append(literal)
+        elif segment[0] == FOR:
+            rebased.append((FOR, segment[1], segment[2], rebase_segments(segment[3], base_path, minify)))
+        elif segment[0] == IF:
+            rebased.append((
+                IF, segment[1], segment[2],
+                rebase_segments(segment[3], base_path, minify), rebase_segments(segment[4], base_path, minify),
+            ))
+        else:
+            rebased.append(segment)
+    return rebased
+
+def render_segments(segments, parts, context, loader, name, base_path="/", minifier=None):
+    for segment in segments:
+        if type(segment) is str:
+            parts.append(segment)
+            continue
+        kind = segment[0]
+        if kind == LITERAL:
+            parts.append(segment[1])
+            minifier.saved += segment[2]
+        elif kind == VAR:
+            value = lookup(context, segment[1])
+            if value is not None:
+                parts.append(str(value))
+        elif kind == FOR:
+            items = lookup(context, segment[2])
+            if items:
+                scope = dict(context)
+                for item in items:
+                    scope[segment[1]] = item
+                    render_segments(segment[3], parts, scope, loader, name, base_path, minifier)
+        elif kind == IF:
+            if bool(lookup(context, segment[1])) != segment[2]:
+                render_segments(segment[3], parts, context, loader, name, base_path, minifier)
+            else:
+                render_segments(segment[4], parts, context, loader, name, base_path, minifier)
+        elif loader is None:
+            raise TemplateError(f"Cannot include '{segment[1]}' without a loader", name)
+        else:
+            loader.include(segment[1]).render_into(parts, context, loader, base_path, minifier)
+
+def lookup(context, path):
+    # Callable values are computed only when a template actually uses them.
+    value = context.get(path[0])
+    for key in path[1:]:
+        if value is None:
+            return None
+        if isinstance(value, dict):
+            value = value.get(key)
+        else:
+            value = getattr(value, key, None)
+    if callable(value):
+        return value()
+    return value
@@ -0,0 +1,84 @@
+import os, tempfile, unittest
+
+from astcache import ASTCache, PARSER_VERSION, dumps, loads
+from htmlnode import HTMLNode, ParentNode
+from transformers import parse_page
+
+PAGE = """# Title
+
+Some **bold** [link](/x) text.
+
+## Section
+
+```python
+x = 1
+```
+
+- a
+  - b
+"""
+
+class TestASTCache(unittest.TestCase):
+    def test_round_trip(self):
+        root, state = parse_page(PAGE)
+        loaded_root, loaded_state = loads(dumps(root, state))
+        self.assertEqual(loaded_root.to_html(), root.to_html())
+        self.assertEqual(loaded_state.title, "Title")
+        self.assertEqual(loaded_state.description, state.description)
+        self.assertEqual(loaded_state.word_count, state.word_count)
+        self.assertEqual(loaded_state.toc_node().to_html(), state.toc_node().to_html())
+
+    def test_links_survive_round_trip(self):
+        root, state = parse_page(PAGE, base_path="/a/")
+        loaded_root, loaded_state = loads(dumps(root, state))
+        self.assertIn('href="/a/x"', loaded_root.to_html())
+        loaded_state.apply_base_path("/b/")
+        self.assertIn('href="/b/x"', loaded_root.to_html())
+
+    def test_cache_retargets_hits(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ASTCache(cache_dir, memory_size=4)
+            first, _ = cache.parse_page(PAGE, "/a/")
+            self.assertIn('href="/a/x"', first.to_html())
+            second, _ = cache.parse_page(PAGE, "/b/")
+            self.assertIn('href="/b/x"', second.to_html())
+            self.assertEqual(cache.hits, 1)
+
+    def test_version_mismatch(self):
+        import marshal
+        data = marshal.dumps((PARSER_VERSION + 1, (), ()))
+        with self.assertRaises(ValueError):
+            loads(data)
+
+    def test_cache_hits(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ASTCache(cache_dir)
+            first, _ = cache.parse_page(PAGE)
+            second, state = cache.parse_page(PAGE)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertEqual(first.to_html(), second.to_html())
+            self.assertEqual(state.title, "Title")
+            self.assertTrue(os.path.exists(cache.path(PAGE)))
+
+            cache.parse_page(PAGE + "\nmore")
+            self.assertEqual(cache.misses, 2)
+
+    def test_corrupt_entry_reparses(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ASTCache(cache_dir)
+            path = cache.path(PAGE)
+            os.makedirs(os.path.dirname(path))
+            with open(path, "wb") as f:
+                f.write(b"garbage")
+            root, _ = cache.parse_page(PAGE)
+            self.assertEqual(cache.misses, 1)
+            self.assertEqual(root.to_html(), parse_page(PAGE)[0].to_html())
+
+    def test_unknown_node_not_stored(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ASTCache(cache_dir)
+            root = ParentNode("div", [HTMLNode("x")])
+            self.assertFalse(cache.store("md", root, parse_page("md")[1]))
+
+if __name__ == "__main__":
+    unittest.main()
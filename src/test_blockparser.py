@@ -0,0 +1,80 @@
+import unittest
+
+from blockparser import Container, Leaf, parse_blocks
+from transformers import markdown_to_blocks, markdown_to_html_node
+
+class TestBlockParser(unittest.TestCase):
+    def test_tree(self):
+        root = parse_blocks("# title\n\n- a\n  - b\n\n> quote")
+        self.assertEqual([child.kind for child in root.children], ["paragraph", "list", "quote"])
+        self.assertEqual([child.line for child in root.children], [0, 2, 5])
+        outer = root.children[1]
+        self.assertIsInstance(outer.children[0], Container)
+        self.assertEqual(outer.children[0].children[1].kind, "list")
+
+    def test_fence_keeps_blank_lines(self):
+        root = parse_blocks("```\nx\n\ny\n```\nafter")
+        self.assertIsInstance(root.children[0], Leaf)
+        self.assertEqual(root.children[0].text(), "```\nx\n\ny\n```")
+        self.assertEqual(root.children[1].text(), "after")
+
+    def test_unterminated_fence(self):
+        root = parse_blocks("```\ncode")
+        self.assertEqual(root.children[0].text(), "```\ncode\n```")
+
+    def test_loose_and_tight(self):
+        self.assertFalse(parse_blocks("- a\n- b").children[0].loose)
+        self.assertTrue(parse_blocks("- a\n\n- b").children[0].loose)
+        self.assertTrue(parse_blocks("- a\n\n  more\n- b").children[0].loose)
+        self.assertFalse(parse_blocks("- a\n\nafter").children[0].loose)
+
+    def test_blocks_keep_code_together(self):
+        md = "para\n\n```\nx\n\ny\n```\n\n- a\n\n  b"
+        self.assertEqual(markdown_to_blocks(md), ["para", "```\nx\n\ny\n```", "- a\n\n  b"])
+
+class TestNestedHTML(unittest.TestCase):
+    def assertHTML(self, md, html):
+        self.assertEqual(markdown_to_html_node(md).to_html(), html)
+
+    def test_nested_lists(self):
+        self.assertHTML(
+            "- a\n  - b\n    1. c\n- d",
+            "<div><ul><li>a<ul><li>b<ol><li>c</li></ol></li></ul></li><li>d</li></ul></div>",
+        )
+
+    def test_item_spanning_paragraphs(self):
+        self.assertHTML(
+            "1. first\n\n   still first\n2. second",
+            "<div><ol><li><p>first</p><p>still first</p></li><li><p>second</p></li></ol></div>",
+        )
+
+    def test_code_in_item(self):
+        self.assertHTML(
+            "- run\n\n  ```\n  a\n\n  b\n  ```",
+            "<div><ul><li><p>run</p><pre><code>a\n\nb\n</code></pre></li></ul></div>",
+        )
+
+    def test_quote_with_blocks(self):
+        self.assertHTML(
+            "> # Title\n>\n> - one\n> - two",
+            '<div><blockquote><h1 id="title">Title</h1><ul><li>one</li><li>two</li></ul></blockquote></div>',
+        )
+
+    def test_lazy_continuation(self):
+        self.assertHTML("> a\nb", "<div><blockquote>a b</blockquote></div>")
+        self.assertHTML("- a\nb", "<div><ul><li>a b</li></ul></div>")
+
+    def test_ordered_start(self):
+        self.assertHTML("3. a\n7. b", '<div><ol start="3"><li>a</li><li>b</li></ol></div>')
+
+    def test_ordered_does_not_interrupt_paragraph(self):
+        self.assertHTML("In\n2024. it rained", "<div><p>In 2024. it rained</p></div>")
+
+    def test_list_type_change(self):
+        self.assertHTML("1. a\n- b", "<div><ol><li>a</li></ol><ul><li>b</li></ul></div>")
+
+    def test_empty_item(self):
+        self.assertHTML("-\n- x", "<div><ul><li></li><li>x</li></ul></div>")
+
+if __name__ == "__main__":
+    unittest.main()
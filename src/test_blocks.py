@@ -0,0 +1,58 @@
+import unittest
+
+from blocks import BlockType, block_to_block_type, default_block_registry
+from htmlnode import LeafNode, ParentNode
+from transformers import markdown_to_html_node
+
+def is_table(block):
+    return all(line.startswith("|") for line in block.split("\n"))
+
+def block_to_table(block, state):
+    rows = []
+    for line in block.split("\n"):
+        cells = [LeafNode("td", cell.strip()) for cell in line.strip("|").split("|")]
+        rows.append(ParentNode("tr", cells))
+    return ParentNode("table", rows)
+
+class TestBlockRegistry(unittest.TestCase):
+    def test_only_candidates_run(self):
+        calls = []
+        def spy(block):
+            calls.append(block)
+            return False
+
+        registry = default_block_registry.copy()
+        registry.register("spy", "%", spy)
+        self.assertEqual(registry.block_type("# heading"), BlockType.HEADING)
+        self.assertEqual(registry.block_type("plain text"), BlockType.PARAGRAPH)
+        self.assertEqual(calls, [])
+        self.assertEqual(registry.block_type("% not a spy"), BlockType.PARAGRAPH)
+        self.assertEqual(calls, ["% not a spy"])
+
+    def test_custom_block_type(self):
+        registry = default_block_registry.copy()
+        registry.register("table", "|", is_table, block_to_table)
+        html = markdown_to_html_node("| a | b |\n| c | d |\n\n# title", registry).to_html()
+        self.assertEqual(
+            html,
+            "<div><table><tr><td>a</td><td>b</td></tr><tr><td>c</td><td>d</td></tr></table><h1 id=\"title\">title</h1></div>",
+        )
+        self.assertEqual(block_to_block_type("| a |"), BlockType.PARAGRAPH)
+
+    def test_missing_renderer(self):
+        registry = default_block_registry.copy()
+        registry.register("math", "$", lambda block: block.startswith("$$"))
+        with self.assertRaises(ValueError):
+            markdown_to_html_node("$$ x $$", registry)
+
+    def test_bad_trigger(self):
+        with self.assertRaises(ValueError):
+            default_block_registry.copy().register("math", ["$$"], lambda block: True)
+
+    def test_code_block_edges(self):
+        self.assertEqual(block_to_block_type("```"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("```\ncode"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("```py\ncode\n```"), BlockType.CODE)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import io, json, unittest
+
+from buildlog import BuildLog, DEBUG, INFO, WARNING
+
+class FakeClock():
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestBuildLog(unittest.TestCase):
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.clock = FakeClock()
+
+    def make(self, level=INFO, json_events=False, batch_size=256):
+        return BuildLog(level, json_events, interval=1.0, batch_size=batch_size, stream=self.stream, clock=self.clock)
+
+    def test_progress_is_rate_limited(self):
+        log = self.make()
+        for _ in range(100):
+            log.file_event("rendered", "Generating page")
+        self.assertEqual(self.stream.getvalue(), "")
+        self.clock.now = 1.5
+        log.file_event("copied", "Copying")
+        self.assertEqual(self.stream.getvalue(), "Progress: 1 copied, 100 rendered..\n")
+        log.file_event("copied", "Copying")
+        log.finish()
+        self.assertEqual(self.stream.getvalue(), "Progress: 1 copied, 100 rendered..\nDone: 2 copied, 100 rendered\n")
+
+    def test_verbose_logs_every_file(self):
+        log = self.make(DEBUG)
+        log.file_event("rendered", "one")
+        log.file_event("rendered", "{} -> {}", "a.md", "a.html")
+        log.flush()
+        self.assertEqual(self.stream.getvalue(), "one\na.md -> a.html\n")
+
+    def test_quiet_only_reports_problems(self):
+        class Unformattable():
+            def __format__(self, spec):
+                raise AssertionError("formatted in quiet mode")
+        log = self.make(WARNING)
+        log.file_event("rendered", "one {}", Unformattable())
+        log.info("hello")
+        log.error("broken")
+        log.finish()
+        self.assertEqual(self.stream.getvalue(), "broken\n")
+
+    def test_output_is_batched(self):
+        log = self.make(DEBUG, batch_size=3)
+        log.info("a")
+        log.info("b")
+        self.assertEqual(self.stream.getvalue(), "")
+        log.info("c")
+        self.assertEqual(self.stream.getvalue(), "a\nb\nc\n")
+
+    def test_json_events(self):
+        log = self.make(DEBUG, json_events=True)
+        log.file_event("rendered", "\tGenerating page", path="a.md")
+        log.flush()
+        event = json.loads(self.stream.getvalue())
+        self.assertEqual((event["level"], event["event"], event["message"], event["path"]), ("debug", "rendered", "Generating page", "a.md"))
+
+if __name__ == "__main__":
+    unittest.main()
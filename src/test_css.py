@@ -0,0 +1,94 @@
+import unittest
+
+from css import CSSIndex, markup_selectors, selector_requirements
+from htmlnode import LeafNode, ParentNode
+from transformers import parse_page
+
+def node_selectors(node, used=None):
+    # Reference walk over a finished tree; parsing records the same set.
+    if used is None:
+        used = set()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.tag is not None:
+            used.add(node.tag)
+        if node.props:
+            for name in node.props.get("class", "").split():
+                used.add(f".{name}")
+            if "id" in node.props:
+                used.add(f"#{node.props['id']}")
+        if node.children:
+            stack.extend(node.children)
+    return used
+
+CSS = """
+@import url("fonts.css");
+/* comment { not a rule } */
+body { margin: 0; }
+h1,
+h2 { color: red; }
+a:hover, .nav a[href^="/"] { color: blue; }
+#toc > ul li { list-style: none; }
+@media (max-width: 600px) {
+  h1 { font-size: 1em; }
+  .wide { display: none; }
+}
+@font-face { font-family: "X"; src: url(x.woff); }
+"""
+
+class TestCSS(unittest.TestCase):
+    def test_requirements(self):
+        self.assertEqual(selector_requirements("a:hover"), {"a"})
+        self.assertEqual(selector_requirements(".nav a[href^=\"/\"]"), {".nav", "a"})
+        self.assertEqual(selector_requirements("#toc > UL li:nth-child(2n+1)"), {"#toc", "ul", "li"})
+        self.assertEqual(selector_requirements("::-webkit-scrollbar"), set())
+        self.assertEqual(selector_requirements("pre code.tok-keyword"), {"pre", "code", ".tok-keyword"})
+
+    def test_select(self):
+        index = CSSIndex(CSS)
+        css = index.select({"body", "h1", "a"})
+        self.assertEqual(
+            css,
+            '@import url("fonts.css");body{margin: 0}h1{color: red}a:hover{color: blue}'
+            '@media (max-width: 600px){h1{font-size: 1em}}@font-face{ font-family: "X"; src: url(x.woff); }',
+        )
+
+    def test_select_is_memoized(self):
+        index = CSSIndex(CSS)
+        self.assertIs(index.select({"h2"}), index.select({"h2"}))
+        self.assertEqual(len(index.selected), 1)
+
+    def test_prune(self):
+        index = CSSIndex(CSS)
+        index.select({"h2"})
+        index.note({"#toc", "ul", "li", ".wide"})
+        pruned = index.prune()
+        self.assertIn("h2{color: red}", pruned)
+        self.assertIn("#toc > ul li{list-style: none}", pruned)
+        self.assertIn("@media (max-width: 600px){.wide{display: none}}", pruned)
+        self.assertNotIn("body", pruned)
+
+    def test_node_selectors(self):
+        node = ParentNode("div", [
+            LeafNode("span", "x", {"class": "tok tok-keyword"}),
+            ParentNode("h2", [LeafNode(None, "t")], {"id": "intro"}),
+        ])
+        self.assertEqual(node_selectors(node), {"div", "span", ".tok", ".tok-keyword", "h2", "#intro"})
+
+    def test_parse_records_selectors(self):
+        markdown = (
+            "# Title\n\n**bold** _it_ `code` [a](/x) ![i](/y.png)\n\n"
+            "> quote\n>\n> - item\n\n1. one\n2. two\n\n"
+            "```python\ndef f(): return 1\n```\n\n```\nplain\n```\n\n- \n"
+        )
+        root_node, state = parse_page(markdown)
+        self.assertEqual(state.selectors, node_selectors(root_node))
+        self.assertIn(".language-python", state.selectors)
+
+    def test_markup_selectors(self):
+        html = '<!doctype html><html><body class="dark wide"><nav id=top><A href="/">x</A></nav></body></html>'
+        self.assertEqual(markup_selectors(html), {"html", "body", ".dark", ".wide", "nav", "#top", "a"})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os, tempfile, threading, unittest
+
+from unittest import mock
+
+import client, main, metrics
+from astcache import ASTCache
+from daemon import BuildDaemon, BuildServer
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.template = os.path.join(self.root, "template.html")
+        self.page = os.path.join(self.root, "index.md")
+        with open(self.template, "w") as f:
+            f.write('<title>{{ Title }}</title><a href="/x">{{ Content }}</a>')
+        with open(self.page, "w") as f:
+            f.write("# Hello\n\nworld")
+        self.daemon = BuildDaemon(ASTCache(os.path.join(self.root, "cache"), 16))
+
+    def tearDown(self):
+        metrics.disable()
+        self.tmp.cleanup()
+
+    def test_render_reuses_warm_cache(self):
+        with mock.patch.object(main, "template_loc", self.template):
+            first = self.daemon.handle_request({"command": "render", "path": self.page, "basepath": "/site/"})
+            second = self.daemon.handle_request({"command": "render", "path": self.page, "basepath": "/site/"})
+        self.assertEqual(first["title"], "Hello")
+        self.assertIn('href="/site/x"', first["html"])
+        self.assertEqual(first["html"], second["html"])
+        self.assertEqual((self.daemon.cache.hits, self.daemon.cache.misses), (1, 1))
+        self.assertEqual(len(self.daemon.cache.trees), 1)
+
+    def test_metrics(self):
+        with mock.patch.object(main, "template_loc", self.template):
+            self.daemon.handle_request({"command": "render", "path": self.page})
+        text = self.daemon.handle_request({"command": "metrics"})["text"]
+        self.assertIn("# TYPE ssg_ast_cache_misses_total counter\nssg_ast_cache_misses_total 1\n", text)
+        data = self.daemon.handle_request({"command": "metrics", "format": "json"})["metrics"]
+        self.assertEqual(data["ssg_page_render_seconds"]["count"], 1)
+
+    def test_unknown_command(self):
+        with self.assertRaises(ValueError):
+            self.daemon.handle_request({"command": "nope"})
+
+    def test_socket_round_trip(self):
+        path = os.path.join(self.root, "daemon.sock")
+        server = BuildServer(path, self.daemon)
+        def serve():
+            while not server.stopping:
+                server.handle_request()
+        thread = threading.Thread(target=serve)
+        thread.start()
+        try:
+            response = client.request({"command": "ping"}, path, timeout=5)
+            self.assertTrue(response["ok"])
+            self.assertEqual(response["pid"], os.getpid())
+            response = client.request({"command": "nope"}, path, timeout=5)
+            self.assertFalse(response["ok"])
+            self.assertIn("nope", response["error"])
+        finally:
+            client.request({"command": "stop"}, path, timeout=5)
+            thread.join(5)
+            server.server_close()
+        self.assertFalse(thread.is_alive())
+
+    def test_client_without_daemon(self):
+        self.assertIsNone(client.request({"command": "ping"}, os.path.join(self.root, "missing.sock")))
+
+if __name__ == "__main__":
+    unittest.main()
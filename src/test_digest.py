@@ -0,0 +1,66 @@
+import io, os, tempfile, unittest
+
+from contextlib import redirect_stderr, redirect_stdout
+
+from digest import ROOT, compare, read_digest, run, tree_digest, write_digest
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+class TestDigest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.a = os.path.join(self.tmp.name, "a")
+        self.b = os.path.join(self.tmp.name, "b")
+        for root in (self.a, self.b):
+            write(os.path.join(root, "index.html"), "home")
+            write(os.path.join(root, "blog", "post.html"), "post")
+            write(os.path.join(root, "blog", "old.html"), "old")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_identical_trees(self):
+        digests = tree_digest(self.a)
+        self.assertEqual(sorted(digests), [ROOT, "blog/", "blog/old.html", "blog/post.html", "index.html"])
+        self.assertEqual(digests, tree_digest(self.b))
+        self.assertEqual(compare(digests, tree_digest(self.b)), [])
+
+    def test_lists_differences(self):
+        write(os.path.join(self.b, "blog", "post.html"), "edited")
+        os.remove(os.path.join(self.b, "blog", "old.html"))
+        write(os.path.join(self.b, "new.html"), "new")
+        a, b = tree_digest(self.a), tree_digest(self.b)
+        self.assertNotEqual(a["blog/"], b["blog/"])
+        self.assertEqual(a["index.html"], b["index.html"])
+        self.assertEqual(compare(a, b), [("removed", "blog/old.html"), ("changed", "blog/post.html"), ("added", "new.html")])
+
+    def test_skips_matching_directories(self):
+        write(os.path.join(self.b, "index.html"), "edited")
+        write(os.path.join(self.b, "new", "deep", "page.html"), "new")
+        a, b = tree_digest(self.a), tree_digest(self.b)
+        # A stale file digest inside a matching directory is never looked at.
+        b["blog/post.html"] = "0" * 64
+        self.assertEqual(compare(a, b), [("changed", "index.html"), ("added", "new/deep/page.html")])
+
+    def test_renamed_file_changes_root(self):
+        os.rename(os.path.join(self.b, "index.html"), os.path.join(self.b, "home.html"))
+        self.assertNotEqual(tree_digest(self.a)[ROOT], tree_digest(self.b)[ROOT])
+
+    def test_digest_file_round_trip(self):
+        path = os.path.join(self.tmp.name, "a.digest")
+        write_digest(path, tree_digest(self.a))
+        self.assertEqual(read_digest(path), tree_digest(self.a))
+        with redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(run(["verify", path, self.b]), 0)
+        self.assertEqual(out.getvalue(), "Builds are identical\n")
+
+        write(os.path.join(self.b, "index.html"), "changed")
+        with redirect_stdout(io.StringIO()) as out, redirect_stderr(io.StringIO()):
+            self.assertEqual(run(["verify", path, self.b]), 1)
+        self.assertEqual(out.getvalue(), "changed: index.html\n")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os, shutil, subprocess, tempfile, unittest
+
+from datetime import date
+from types import GeneratorType
+
+from discovery import PageDates, batched, discover_pages, published_pages, select_pages
+from inventory import scan
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+class TestDiscoverPages(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = self.tmp.name
+        write(os.path.join(self.content, "index.md"), "# Home")
+        write(os.path.join(self.content, "blog", "index.md"), "# Blog")
+        write(os.path.join(self.content, "blog", "first", "index.md"), "# First")
+        write(os.path.join(self.content, "blog", "notes.md"), "# Notes")
+        write(os.path.join(self.content, "blog", "image.png"), "")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_discovers_markdown(self):
+        pages = sorted(discover_pages(self.content), key=lambda page: page.rel_path)
+        self.assertEqual([page.rel_path for page in pages], [
+            os.path.join("blog", "first", "index.html"),
+            os.path.join("blog", "index.html"),
+            os.path.join("blog", "notes.html"),
+            "index.html",
+        ])
+        self.assertEqual([page.url("/site/") for page in pages], [
+            "/site/blog/first/", "/site/blog/", "/site/blog/notes.html", "/site/",
+        ])
+        self.assertEqual([page.section for page in pages], ["blog", "blog", "blog", None])
+
+    def test_is_lazy(self):
+        pages = discover_pages(self.content)
+        self.assertIsInstance(pages, GeneratorType)
+        self.assertTrue(next(pages).source_path.endswith(".md"))
+        self.assertEqual(len(list(pages)), 3)
+
+    def test_reads_inventory(self):
+        inventory = scan(self.content)
+        os.remove(os.path.join(self.content, "blog", "notes.md"))
+        pages = list(discover_pages(self.content, inventory))
+        self.assertEqual([page.name for page in pages], ["blog/first/index.md", "blog/index.md", "blog/notes.md", "index.md"])
+        self.assertEqual(pages[0].mtime, inventory[pages[0].source_path].mtime / 1e9)
+
+    def test_select_by_glob(self):
+        def names(include=(), exclude=()):
+            rejected = []
+            selected = [page.name for page in select_pages(discover_pages(self.content), include, exclude, rejected)]
+            return sorted(selected), len(rejected)
+
+        self.assertEqual(names(["blog/first"]), (["blog/first/index.md"], 3))
+        self.assertEqual(names([os.path.join(self.content, "blog", "first")]), (["blog/first/index.md"], 3))
+        self.assertEqual(names(["blog/*.md"]), (["blog/first/index.md", "blog/index.md", "blog/notes.md"], 1))
+        self.assertEqual(names(["blog"], ["blog/first"]), (["blog/index.md", "blog/notes.md"], 2))
+        self.assertEqual(names(exclude=["*/notes.md"]), (["blog/first/index.md", "blog/index.md", "index.md"], 1))
+
+    def test_drafts_and_scheduled(self):
+        write(os.path.join(self.content, "blog", "notes.md"), "---\ndraft: true\n---\n# Notes")
+        write(os.path.join(self.content, "blog", "first", "index.md"), "---\ndate: 2030-01-01\n---\n# First")
+        write(os.path.join(self.content, "index.md"), "---\ndate: 2020-01-01\n---\n# Home")
+        def names(**options):
+            rejected = []
+            pages = published_pages(discover_pages(self.content), today=date(2025, 6, 1), rejected=rejected, **options)
+            return sorted(page.name for page in pages), sorted(page.name for page in rejected)
+
+        self.assertEqual(names(), (["blog/index.md", "index.md"], ["blog/first/index.md", "blog/notes.md"]))
+        self.assertEqual(names(drafts=True), (["blog/index.md", "blog/notes.md", "index.md"], ["blog/first/index.md"]))
+        self.assertEqual(names(future=True)[1], ["blog/notes.md"])
+
+    def test_broken_front_matter_is_kept(self):
+        write(os.path.join(self.content, "index.md"), "---\nno closing line")
+        names = [page.name for page in published_pages(discover_pages(self.content))]
+        self.assertIn("index.md", names)
+
+    def test_page_dates(self):
+        page = next(discover_pages(self.content))
+        dates = PageDates(self.content, environ={})
+        self.assertEqual(dates.time(page, {"date": "2024-03-01"}), 1709251200)
+        self.assertEqual(dates.time(page, {}), page.mtime)
+        self.assertEqual(PageDates(self.content, {"SOURCE_DATE_EPOCH": "86400"}).time(page, {}), 86400)
+
+    @unittest.skipUnless(shutil.which("git"), "git is not installed")
+    def test_page_dates_from_git(self):
+        environ = dict(os.environ, GIT_DIR=os.path.join(self.content, ".git"), GIT_WORK_TREE=self.content,
+            GIT_AUTHOR_NAME="a", GIT_AUTHOR_EMAIL="a@b", GIT_COMMITTER_NAME="a", GIT_COMMITTER_EMAIL="a@b",
+            GIT_COMMITTER_DATE="@1700000000 +0000")
+        for command in (["init", "-q"], ["add", "."], ["commit", "-q", "-m", "pages"]):
+            subprocess.run(["git", *command], cwd=self.content, env=environ, check=True, capture_output=True)
+        page = next(discover_pages(self.content))
+        os.utime(page.source_path, (0, 0))
+        self.assertEqual(PageDates(self.content, environ={}).time(page, {}), 1700000000)
+
+    def test_batched(self):
+        self.assertEqual(list(batched(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(batched([], 2)), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import os, tempfile, unittest
+
+from errors import MarkdownError
+from frontmatter import read_front_matter, split_front_matter
+
+class TestFrontMatter(unittest.TestCase):
+    def test_no_front_matter(self):
+        self.assertEqual(split_front_matter("# Title"), ({}, "# Title"))
+        self.assertEqual(split_front_matter("----\n# Title"), ({}, "----\n# Title"))
+
+    def test_values(self):
+        markdown = "---\nlayout: blog\ntags: [a, \"b c\"]\ndraft: false\ntitle: 'x: y'\n---\n# Title"
+        front_matter, body = split_front_matter(markdown)
+        self.assertEqual(front_matter, {"layout": "blog", "tags": ["a", "b c"], "draft": False, "title": "x: y"})
+        self.assertEqual(body.split("\n").index("# Title"), markdown.split("\n").index("# Title"))
+
+    def test_errors(self):
+        with self.assertRaises(MarkdownError) as context:
+            split_front_matter("---\nlayout: blog\nnot a pair\n---\n")
+        self.assertEqual(context.exception.line, 3)
+        with self.assertRaises(MarkdownError):
+            split_front_matter("---\nlayout: blog\n")
+
+class TestReadFrontMatter(unittest.TestCase):
+    def test_reads_only_the_block(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "page.md")
+            with open(path, "w") as f:
+                f.write("---\ndraft: true\ndate: 2024-01-02\n---\n# Title\n\n---\nnot: front matter\n")
+            self.assertEqual(read_front_matter(path), {"draft": True, "date": "2024-01-02"})
+            with open(path, "w") as f:
+                f.write("# Title\n---\n")
+            self.assertEqual(read_front_matter(path), {})
+
+if __name__ == "__main__":
+    unittest.main()
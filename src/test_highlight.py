@@ -0,0 +1,60 @@
+import unittest
+
+from highlight import Lexer, highlight, token_cache, tokenize
+from htmlnode import LeafNode
+from transformers import markdown_to_html_node
+
+class TestHighlight(unittest.TestCase):
+    def test_tokenize_python(self):
+        tokens = tokenize('def f(x):\n    return "hi" # done', "python")
+        self.assertListEqual(
+            [
+                ("keyword", "def"),
+                (None, " "),
+                ("function", "f"),
+                (None, "(x):\n    "),
+                ("keyword", "return"),
+                (None, " "),
+                ("string", '"hi"'),
+                (None, " "),
+                ("comment", "# done"),
+            ],
+            tokens,
+        )
+
+    def test_unknown_language(self):
+        self.assertIsNone(tokenize("x", "cobol"))
+        self.assertIsNone(highlight("x", "cobol"))
+
+    def test_cached_by_language_and_hash(self):
+        token_cache.clear()
+        first = tokenize("let x = 1", "js")
+        second = tokenize("let x = 1", "js")
+        self.assertIs(first, second)
+        tokenize("let x = 1", "python")
+        self.assertEqual(len(token_cache), 2)
+
+    def test_highlight_nodes(self):
+        nodes = highlight("true", "JSON")
+        self.assertListEqual([LeafNode("span", "true", {"class": "tok-keyword"})], nodes)
+
+    def test_custom_lexer(self):
+        lexer = Lexer([("keyword", r"\bSELECT\b")])
+        self.assertListEqual([("keyword", "SELECT"), (None, " 1")], lexer.tokenize("SELECT 1"))
+
+    def test_fenced_block_with_language(self):
+        md = "```python\nx = 1\n```"
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            '<div><pre><code class="language-python">x = <span class="tok-number">1</span>\n</code></pre></div>',
+        )
+
+    def test_fenced_block_unknown_language(self):
+        md = "```elflang\nfunc main(){}\n```"
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            '<div><pre><code class="language-elflang">func main(){}\n</code></pre></div>',
+        )
+
+if __name__ == "__main__":
+    unittest.main()
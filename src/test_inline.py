@@ -0,0 +1,144 @@
+import unittest
+
+from htmlnode import LeafNode
+from inline import InlineParser, default_inline_parser
+from textnode import TextNode, TextType
+from transformers import markdown_to_html_node
+
+def strikethrough(text, pos, parser):
+    if not text.startswith("~~", pos):
+        return None
+    end = text.find("~~", pos + 2)
+    if end == -1:
+        return None
+    return LeafNode("s", text[pos + 2:end]), end + 2
+
+class TestInlineParser(unittest.TestCase):
+    def test_builtins(self):
+        nodes = default_inline_parser.parse("a **b** _c_ `d` ![e](f) [g](h)")
+        self.assertListEqual(
+            [
+                TextNode("a ", TextType.TEXT),
+                TextNode("b", TextType.BOLD),
+                TextNode(" ", TextType.TEXT),
+                TextNode("c", TextType.ITALIC),
+                TextNode(" ", TextType.TEXT),
+                TextNode("d", TextType.CODE),
+                TextNode(" ", TextType.TEXT),
+                TextNode("e", TextType.IMAGE, "f"),
+                TextNode(" ", TextType.TEXT),
+                TextNode("g", TextType.LINK, "h"),
+            ],
+            nodes,
+        )
+
+    def test_code_is_not_reparsed(self):
+        nodes = default_inline_parser.parse("`a **b** c`")
+        self.assertListEqual([TextNode("a **b** c", TextType.CODE)], nodes)
+
+    def test_single_star_is_text(self):
+        nodes = default_inline_parser.parse("2 * 3")
+        self.assertListEqual([TextNode("2 * 3", TextType.TEXT)], nodes)
+
+    def test_bang_without_image(self):
+        nodes = default_inline_parser.parse("Hi! [link](url)")
+        self.assertListEqual(
+            [TextNode("Hi! ", TextType.TEXT), TextNode("link", TextType.LINK, "url")],
+            nodes,
+        )
+
+    def test_unmatched_delimiter_is_literal(self):
+        nodes = default_inline_parser.parse("an _unmatched word and **bold**")
+        self.assertListEqual(
+            [TextNode("an _unmatched word and ", TextType.TEXT), TextNode("bold", TextType.BOLD)],
+            nodes,
+        )
+
+    def test_unmatched_code_is_literal(self):
+        self.assertListEqual([TextNode("a `b", TextType.TEXT)], default_inline_parser.parse("a `b"))
+
+    def test_empty(self):
+        self.assertListEqual([], default_inline_parser.parse(""))
+
+    def test_register_extension(self):
+        parser = default_inline_parser.copy()
+        parser.register("~", strikethrough)
+        nodes = parser.parse("a ~~b~~ **c**")
+        self.assertListEqual(
+            [
+                TextNode("a ", TextType.TEXT),
+                LeafNode("s", "b"),
+                TextNode(" ", TextType.TEXT),
+                TextNode("c", TextType.BOLD),
+            ],
+            nodes,
+        )
+        self.assertListEqual([TextNode("a ~~b", TextType.TEXT)], parser.parse("a ~~b"))
+        self.assertNotIn("~", default_inline_parser.parsers)
+
+    def test_shared_trigger_prefers_longest(self):
+        parser = InlineParser()
+        parser.register_delimiter("*", TextType.ITALIC)
+        parser.register_delimiter("**", TextType.BOLD)
+        self.assertListEqual(
+            [TextNode("b", TextType.BOLD), TextNode(" ", TextType.TEXT), TextNode("i", TextType.ITALIC)],
+            parser.parse("**b** *i*"),
+        )
+
+    def test_register_delimiter(self):
+        parser = default_inline_parser.copy()
+        parser.register_delimiter("~~", TextType.CODE)
+        self.assertListEqual(
+            [TextNode("a", TextType.CODE)],
+            parser.parse("~~a~~"),
+        )
+
+    def test_bad_trigger(self):
+        with self.assertRaises(ValueError):
+            InlineParser().register("~~", strikethrough)
+
+class TestNestedInline(unittest.TestCase):
+    def assertHTML(self, md, html):
+        self.assertEqual(markdown_to_html_node(md).to_html(), f"<div><p>{html}</p></div>")
+
+    def test_italic_in_bold(self):
+        self.assertListEqual(
+            [
+                TextNode("bold italic", TextType.BOLD, None, [
+                    TextNode("bold ", TextType.TEXT),
+                    TextNode("italic", TextType.ITALIC),
+                ]),
+            ],
+            default_inline_parser.parse("**bold _italic_**"),
+        )
+        self.assertHTML("**bold _italic_**", "<b>bold <i>italic</i></b>")
+
+    def test_bold_in_italic(self):
+        self.assertHTML("_a **b** c_", "<i>a <b>b</b> c</i>")
+
+    def test_link_in_bold(self):
+        self.assertHTML("**see [here](/x)**", '<b>see <a href="/x">here</a></b>')
+
+    def test_markup_in_link(self):
+        self.assertHTML("[**bold** link](/x)", '<a href="/x"><b>bold</b> link</a>')
+
+    def test_intraword_underscore(self):
+        self.assertHTML("snake_case_name and a_b", "snake_case_name and a_b")
+        self.assertHTML("see https://x.com/a_b/c_d", "see https://x.com/a_b/c_d")
+
+    def test_intraword_bold(self):
+        self.assertHTML("un**frigging**believable", "un<b>frigging</b>believable")
+
+    def test_crossed_delimiters(self):
+        self.assertHTML("**a _b** c_", "<b>a _b</b> c_")
+
+    def test_unmatched_markers(self):
+        self.assertHTML("**never closed _and this", "**never closed _and this")
+        self.assertHTML("2 * 3 ** 4", "2 * 3 ** 4")
+
+    def test_plain_text_heading_slug(self):
+        html = markdown_to_html_node("## **A _b_**").to_html()
+        self.assertEqual(html, '<div><h2 id="a-b"><b>A <i>b</i></b></h2></div>')
+
+if __name__ == "__main__":
+    unittest.main()
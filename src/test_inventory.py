@@ -0,0 +1,56 @@
+import os, tempfile, unittest
+
+from inventory import DIR, FileEntry, changed_files, load_inventory, removed_files, save_inventory, scan
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+class TestInventory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        write(os.path.join(self.root, "a.md"), "a")
+        write(os.path.join(self.root, "blog", "b.md"), "bb")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_scan(self):
+        table = scan(self.root)
+        blog = os.path.join(self.root, "blog")
+        self.assertEqual(list(table), [os.path.join(self.root, "a.md"), blog, os.path.join(blog, "b.md")])
+        self.assertEqual(table[blog].kind, DIR)
+        self.assertEqual(table[os.path.join(blog, "b.md")].size, 2)
+
+    def test_changed_and_removed(self):
+        previous = scan(self.root)
+        a_path = os.path.join(self.root, "a.md")
+        b_path = os.path.join(self.root, "blog", "b.md")
+        c_path = os.path.join(self.root, "c.md")
+        write(a_path, "changed")
+        write(c_path, "new")
+        os.remove(b_path)
+        table = scan(self.root)
+        self.assertEqual(sorted(changed_files(table, previous)), [a_path, c_path])
+        self.assertEqual(removed_files(table, previous), [b_path])
+        self.assertEqual(changed_files(table, table), [])
+
+    def test_save_and_load(self):
+        table = scan(self.root)
+        path = os.path.join(self.root, "cache", "inventory.json")
+        save_inventory(path, table, {"basepath": "/"})
+        loaded, options = load_inventory(path)
+        self.assertEqual(loaded, table)
+        self.assertEqual(options, {"basepath": "/"})
+
+    def test_load_missing(self):
+        self.assertEqual(load_inventory(os.path.join(self.root, "missing.json")), ({}, None))
+
+    def test_entry_eq(self):
+        self.assertEqual(FileEntry("a", 1, 2), FileEntry("a", 1, 2))
+        self.assertNotEqual(FileEntry("a", 1, 2), FileEntry("a", 1, 3))
+
+if __name__ == "__main__":
+    unittest.main()
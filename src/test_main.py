@@ -0,0 +1,263 @@
+import io, os, tempfile, unittest
+
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+
+import main as main_module
+
+from blocks import default_block_registry
+from errors import BuildError, MarkdownError
+from discovery import discover_pages
+from buildlog import log
+from main import Target, main, manifest_name, generate_pages_recursive, generate_targets, parse_args, render_page, render_pages, swap_into_place
+from template import TemplateLoader
+from css import CSSIndex
+from transformers import markdown_to_html_node, parse_page
+
+TEMPLATE = "<title>{{ Title }}</title>{{ Content }}"
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+class TestKeepGoing(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, "content")
+        self.out = os.path.join(self.root, "out")
+        self.template = os.path.join(self.root, "template.html")
+        write(self.template, TEMPLATE)
+        write(os.path.join(self.content, "good", "index.md"), "# Good\n\nfine")
+        write(os.path.join(self.content, "bad", "index.md"), "no title here")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_collects_errors(self):
+        errors = []
+        generate_pages_recursive(self.content, self.template, self.out, "/", errors=errors)
+        self.assertTrue(os.path.exists(os.path.join(self.out, "good", "index.html")))
+        self.assertFalse(os.path.exists(os.path.join(self.out, "bad", "index.html")))
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0].path, os.path.join(self.content, "bad", "index.md"))
+        self.assertIn("Invalid/No Title found!", str(errors[0]))
+
+    def test_failed_pages_are_not_counted(self):
+        log.configure()
+        generate_pages_recursive(self.content, self.template, self.out, "/", errors=[])
+        self.assertEqual(log.counts, {"rendered": 1})
+        log.configure()
+
+    def test_raises_without_keep_going(self):
+        with self.assertRaises(Exception):
+            generate_pages_recursive(self.content, self.template, self.out, "/")
+
+    def test_renders_filtered_stream(self):
+        pages = (page for page in discover_pages(self.content) if page.section != "bad")
+        render_pages(pages, [Target(self.out, "/", self.template)])
+        self.assertTrue(os.path.exists(os.path.join(self.out, "good", "index.html")))
+        self.assertFalse(os.path.exists(os.path.join(self.out, "bad")))
+
+    def test_unchanged_pages_are_kept(self):
+        good = os.path.join(self.content, "good", "index.md")
+        dest = os.path.join(self.out, "good", "index.html")
+        write(dest, "previous output")
+        sink = []
+        class ListSink():
+            def add(self, record):
+                sink.append(record)
+        errors = []
+        generate_pages_recursive(self.content, self.template, self.out, "/", [ListSink()], errors=errors, unchanged={good})
+        with open(dest) as f:
+            self.assertEqual(f.read(), "previous output")
+        self.assertEqual([record.title for record in sink], ["Good"])
+
+class TestTargets(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, "content")
+        self.template = os.path.join(self.root, "template.html")
+        self.localized = os.path.join(self.root, "template.fr.html")
+        write(self.template, TEMPLATE)
+        write(self.localized, "<title lang=fr>{{ Title }}</title>{{ Content }}")
+        write(os.path.join(self.content, "blog", "post.md"), "# Post\n\n[home](/)")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_targets_share_one_parse(self):
+        targets = [
+            Target(os.path.join(self.root, "site"), "/site/", self.template),
+            Target(os.path.join(self.root, "fr"), "/fr/", self.localized),
+        ]
+        records = []
+        class ListSink():
+            def add(self, record):
+                records.append(record)
+        for target in targets:
+            target.sinks = [ListSink()]
+        parses = []
+        class CountingCache():
+            def parse_page(self, markdown, base_path):
+                parses.append(base_path)
+                return parse_page(markdown, base_path=base_path)
+        generate_targets(self.content, targets, cache=CountingCache())
+        self.assertEqual(parses, ["/site/"])
+        with open(os.path.join(self.root, "site", "blog", "post.html")) as f:
+            self.assertEqual(f.read(), '<title>Post</title><div><h1 id="post">Post</h1><p><a href="/site/">home</a></p></div>')
+        with open(os.path.join(self.root, "fr", "blog", "post.html")) as f:
+            self.assertEqual(f.read(), '<title lang=fr>Post</title><div><h1 id="post">Post</h1><p><a href="/fr/">home</a></p></div>')
+        self.assertEqual([record.url for record in records], ["/site/blog/post.html", "/fr/blog/post.html"])
+
+    def test_target_template_beats_section_layout(self):
+        layouts = os.path.join(self.root, "layouts")
+        write(os.path.join(layouts, "blog.html"), "<title>blog {{ Title }}</title>")
+        targets = [
+            Target(os.path.join(self.root, "site"), "/site/", self.template),
+            Target(os.path.join(self.root, "fr"), "/fr/", self.localized),
+        ]
+        with mock.patch.object(main_module, "layouts_dir", layouts), mock.patch.object(main_module, "template_loc", self.template):
+            generate_targets(self.content, targets)
+        with open(os.path.join(self.root, "site", "blog", "post.html")) as f:
+            self.assertEqual(f.read(), "<title>blog Post</title>")
+        with open(os.path.join(self.root, "fr", "blog", "post.html")) as f:
+            self.assertTrue(f.read().startswith("<title lang=fr>Post</title>"))
+
+    def test_parse_target(self):
+        args = parse_args(["--target", "out=/a/", "--target", f"fr=/fr/:{self.localized}"])
+        self.assertEqual([(t.out_dir, t.base_path, t.template_path) for t in args.target], [
+            ("out", "/a/", "./template.html"),
+            ("fr", "/fr/", self.localized),
+        ])
+        self.assertEqual(parse_args(["/x/"]).target[0].base_path, "/x/")
+        with redirect_stderr(io.StringIO()):
+            for argv in (["--target", "out"], ["--target", "out=/a"], ["/x/", "--target", "out=/a/"],
+                         ["--object-store", "s", "--target", "a/docs=/a/", "--target", "./a/docs/=/b/"]):
+                with self.assertRaises(SystemExit):
+                    parse_args(argv)
+
+    def test_manifest_name(self):
+        self.assertEqual(manifest_name("docs"), "docs")
+        self.assertEqual(manifest_name("./a/docs/"), "a-docs")
+        self.assertNotEqual(manifest_name("a/docs"), manifest_name("b/docs"))
+        args = parse_args(["--object-store", "s", "--target", "a/docs=/a/", "--target", "b/docs=/b/"])
+        self.assertEqual(len(args.target), 2)
+
+class TestLayouts(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.layouts = os.path.join(self.root, "layouts")
+        self.template = os.path.join(self.root, "template.html")
+        write(self.template, TEMPLATE)
+        write(os.path.join(self.layouts, "partials", "nav.html"), '<a href="/">{{ site.title }}</a>')
+        write(os.path.join(self.layouts, "post.html"), '{% include "partials/nav.html" %}'
+            '{% for tag in page.tags %}#{{ tag }}{% endfor %}{% for h in page.headings %}[{{ h.id }}]{% endfor %}')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_front_matter_layout(self):
+        page = os.path.join(self.root, "page.md")
+        write(page, "---\nlayout: post\ntags: [a, b]\n---\n# Hello\n\n## Part")
+        html, state = render_page(page, self.template, "/site/", loader=TemplateLoader(self.layouts))
+        self.assertEqual(html, '<a href="/site/">Tolkien Fan Club</a>#a#b[hello][part]')
+        self.assertEqual(state.title, "Hello")
+
+    def test_inline_css(self):
+        write(os.path.join(self.layouts, "styled.html"), '<head>{% include "partials/nav.html" %}<style>{{ CriticalCSS }}</style></head>{{ Content }}')
+        page = os.path.join(self.root, "page.md")
+        write(page, "---\nlayout: styled\n---\n# Hello\n\n`x`")
+        css_index = CSSIndex("head{a:1}a{b:2}h1{c:3}code{d:4}blockquote{e:5}.tok-string{f:6}")
+        html, _ = render_page(page, self.template, "/", loader=TemplateLoader(self.layouts), css_index=css_index)
+        self.assertIn("<style>head{a:1}a{b:2}h1{c:3}code{d:4}</style>", html)
+        self.assertEqual(css_index.used, {"head", "a", "style", "div", "h1", "#hello", "p", "code"})
+
+    def test_default_template(self):
+        page = os.path.join(self.root, "page.md")
+        write(page, "# Hello")
+        html, _ = render_page(page, self.template, "/", loader=TemplateLoader(self.layouts))
+        self.assertEqual(html, '<title>Hello</title><div><h1 id="hello">Hello</h1></div>')
+
+class TestIncrementalBuild(unittest.TestCase):
+    # Runs whole builds in a scratch site; the build reads ./static,
+    # ./content and ./template.html relative to the working directory.
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        write(os.path.join(".", "template.html"), "<title>{{ Title }}</title><style>{{ CriticalCSS }}</style>{{ Content }}")
+        write(os.path.join("static", "index.css"), "h1{a:1}")
+        for name in ("one", "two"):
+            write(os.path.join("content", name, "index.md"), f"# {name}\n\ntext")
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def build(self, *argv):
+        with redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(main(["--no-cache", "--incremental", *argv]), 0)
+        return out.getvalue()
+
+    def page(self, name):
+        with open(os.path.join("docs", name, "index.html")) as f:
+            return f.read()
+
+    def test_stylesheet_change_rebuilds_inlined_pages(self):
+        self.build("--inline-css")
+        write(os.path.join("static", "index.css"), "h1{a:1}p{b:2}")
+        self.build("--inline-css")
+        self.assertIn("p{b:2}", self.page("one"))
+        self.assertIn("p{b:2}", self.page("two"))
+
+    def test_partial_build_keeps_template_change_pending(self):
+        self.build()
+        write(os.path.join(".", "template.html"), "<title>new {{ Title }}</title>{{ Content }}")
+        self.build("--include", "content/one")
+        self.assertIn("new one", self.page("one"))
+        self.assertNotIn("new", self.page("two"))
+        self.build()
+        self.assertIn("new two", self.page("two"))
+
+class TestErrors(unittest.TestCase):
+    def test_block_error_has_line(self):
+        def explode(block, state):
+            raise ValueError("boom")
+
+        registry = default_block_registry.copy()
+        registry.register("explode", "!", lambda block: block.startswith("!!"), explode)
+        with self.assertRaises(MarkdownError) as context:
+            markdown_to_html_node("# Title\n\n- list\n\n  !! nested", registry)
+        self.assertEqual(context.exception.line, 5)
+        self.assertEqual(context.exception.message, "boom")
+
+    def test_build_error_str(self):
+        self.assertEqual(str(BuildError("a.md", "bad", 3)), "a.md:3: bad")
+        self.assertEqual(str(BuildError("a.md", "bad")), "a.md: bad")
+
+class TestSwap(unittest.TestCase):
+    def test_swap_replaces_target(self):
+        with tempfile.TemporaryDirectory() as root:
+            target = os.path.join(root, "docs")
+            staging = os.path.join(root, "docs.staging")
+            write(os.path.join(target, "old.html"), "old")
+            write(os.path.join(staging, "new.html"), "new")
+            swap_into_place(staging, target)
+            self.assertEqual(os.listdir(target), ["new.html"])
+            self.assertFalse(os.path.exists(staging))
+            self.assertFalse(os.path.exists(f"{target}.old"))
+
+    def test_swap_without_target(self):
+        with tempfile.TemporaryDirectory() as root:
+            target = os.path.join(root, "docs")
+            staging = os.path.join(root, "docs.staging")
+            write(os.path.join(staging, "new.html"), "new")
+            swap_into_place(staging, target)
+            self.assertEqual(os.listdir(target), ["new.html"])
+
+if __name__ == "__main__":
+    unittest.main()
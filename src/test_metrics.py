@@ -0,0 +1,61 @@
+import json, os, tempfile, unittest
+
+import metrics
+from main import render_page
+from metrics import MetricsRegistry
+from transformers import markdown_to_html_node
+
+class TestRegistry(unittest.TestCase):
+    def test_prometheus(self):
+        registry = MetricsRegistry()
+        registry.counter("ssg_pages_rendered_total").inc(3)
+        histogram = registry.histogram("ssg_page_nodes", (10, 100))
+        for value in (5, 10, 50, 500):
+            histogram.observe(value)
+        self.assertEqual(registry.to_prometheus(), "\n".join([
+            "# HELP ssg_page_nodes HTML nodes per rendered page tree.",
+            "# TYPE ssg_page_nodes histogram",
+            'ssg_page_nodes_bucket{le="10"} 2',
+            'ssg_page_nodes_bucket{le="100"} 3',
+            'ssg_page_nodes_bucket{le="+Inf"} 4',
+            "ssg_page_nodes_sum 565",
+            "ssg_page_nodes_count 4",
+            "# HELP ssg_pages_rendered_total Pages rendered and written, per target.",
+            "# TYPE ssg_pages_rendered_total counter",
+            "ssg_pages_rendered_total 3",
+        ]) + "\n")
+
+    def test_json(self):
+        registry = MetricsRegistry()
+        registry.gauge("ssg_build_seconds").set(1.5)
+        registry.histogram("ssg_page_nodes", (10,)).observe(20)
+        self.assertEqual(json.loads(registry.to_json()), {
+            "ssg_build_seconds": 1.5,
+            "ssg_page_nodes": {"count": 1, "sum": 20, "buckets": {"10": 0, "+Inf": 1}},
+        })
+
+class TestInstrumentation(unittest.TestCase):
+    def tearDown(self):
+        metrics.disable()
+
+    def test_disabled_records_nothing(self):
+        markdown_to_html_node("# Title\n\ntext")
+        self.assertIsNone(metrics.active)
+
+    def test_render_page(self):
+        registry = metrics.enable()
+        with tempfile.TemporaryDirectory() as root:
+            page = os.path.join(root, "page.md")
+            template = os.path.join(root, "template.html")
+            with open(page, "w") as f:
+                f.write("# Title\n\nsome **text**")
+            with open(template, "w") as f:
+                f.write("{{ Content }}")
+            render_page(page, template, "/")
+        for name in ("ssg_inline_parse_seconds_total", "ssg_block_parse_seconds_total", "ssg_to_html_seconds_total", "ssg_template_seconds_total"):
+            self.assertGreater(registry.counter(name).value, 0, name)
+        self.assertEqual(registry.histogram("ssg_page_nodes").sum, 6)
+        self.assertEqual(registry.histogram("ssg_page_render_seconds").count, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from htmlnode import LeafNode, ParentNode
+from minify import Minifier, minify_markup
+from template import Template
+from transformers import markdown_to_html_node
+
+class TestMinify(unittest.TestCase):
+    def test_node_serialization(self):
+        node = ParentNode("p", [
+            LeafNode(None, "some   spaced\n text "),
+            LeafNode("a", "a  link", {"href": "/x", "title": "two words", "alt": ""}),
+        ], {"class": "intro"})
+        minifier = Minifier()
+        html = node.to_html(minifier)
+        self.assertEqual(html, '<p class=intro>some spaced text <a href=/x title="two words" alt="">a link</a></p>')
+        self.assertEqual(minifier.saved, len(node.to_html()) - len(html))
+
+    def test_code_preserved(self):
+        root = markdown_to_html_node("Use `a   b` here.\n\n```\nif x:\n    y  =  1\n```")
+        minifier = Minifier()
+        html = root.to_html(minifier)
+        self.assertIn("<code>a   b</code>", html)
+        self.assertIn("\n    y  =  1\n", html)
+        self.assertEqual(minifier.saved, len(root.to_html()) - len(html))
+
+    def test_markup(self):
+        html = '<!doctype html>\n<html>\n  <head>\n    <link href="/a.css" rel="stylesheet" />\n  <!-- note -->\n  </head>\n  <body>\n    <p>Hi <b>there</b></p>\n  </body>\n</html>'
+        self.assertEqual(
+            minify_markup(html),
+            "<!doctype html><html><head><link href=/a.css rel=stylesheet /></head><body><p>Hi <b>there</b></p></body></html>",
+        )
+
+    def test_markup_preserves_pre(self):
+        html = '<div>\n  <pre class="x">  keep\n   this </pre>\n</div>'
+        self.assertEqual(minify_markup(html), '<div><pre class="x">  keep\n   this </pre></div>')
+
+    def test_template_counts_saved(self):
+        template = Template('<ul>\n{% for item in items %}  <li class="item">{{ item }}</li>\n{% endfor %}</ul>')
+        context = {"items": ["a", "b"]}
+        minifier = Minifier()
+        html = template.render(context, minifier=minifier)
+        self.assertEqual(html, "<ul><li class=item>a</li><li class=item>b</li></ul>")
+        self.assertEqual(minifier.saved, len(template.render(context)) - len(html))
+
+if __name__ == "__main__":
+    unittest.main()
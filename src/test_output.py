@@ -0,0 +1,78 @@
+import json, os, tarfile, tempfile, unittest, zipfile
+
+from output import DirectoryOutput, ObjectStore, StoreOutput, TarOutput, ZipOutput
+from sitemap import SitemapWriter
+from pages import PageRecord
+
+class TestOutputs(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.out = os.path.join(self.root, "docs")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def fill(self, output):
+        output.write(os.path.join(self.out, "index.html"), "<p>hi</p>")
+        output.write(os.path.join(self.out, "blog", "index.html"), "<p>hi</p>")
+        output.write(os.path.join(self.out, "logo.png"), b"\x89PNG")
+        sitemap = SitemapWriter(self.out, "https://example.com", output=output)
+        sitemap.add(PageRecord("a.md", "a.html", "/a.html", 0))
+        sitemap.close()
+        output.close()
+
+    def test_directory(self):
+        self.fill(DirectoryOutput(self.out))
+        with open(os.path.join(self.out, "blog", "index.html")) as f:
+            self.assertEqual(f.read(), "<p>hi</p>")
+        self.assertIn("sitemap-1.xml", os.listdir(self.out))
+
+    def test_tar_links_duplicates(self):
+        archive_path = f"{self.out}.tar.gz"
+        output = TarOutput(self.out, archive_path)
+        self.fill(output)
+        self.assertFalse(os.path.exists(self.out))
+        self.assertEqual(output.saved, len("<p>hi</p>"))
+        with tarfile.open(archive_path) as tar:
+            members = {member.name: member for member in tar.getmembers()}
+            self.assertEqual(sorted(members), ["blog/index.html", "index.html", "logo.png", "sitemap-1.xml", "sitemap.xml"])
+            self.assertTrue(members["blog/index.html"].islnk())
+            self.assertEqual(members["blog/index.html"].linkname, "index.html")
+            self.assertEqual(tar.extractfile("logo.png").read(), b"\x89PNG")
+
+    def test_zip(self):
+        archive_path = f"{self.out}.zip"
+        self.fill(ZipOutput(self.out, archive_path))
+        with zipfile.ZipFile(archive_path) as archive:
+            self.assertEqual(archive.read("blog/index.html"), b"<p>hi</p>")
+            self.assertIn("sitemap.xml", archive.namelist())
+
+    def test_archive_creates_parent(self):
+        archive_path = os.path.join(self.root, "a", "docs.zip")
+        self.fill(ZipOutput(os.path.join(self.root, "a", "docs"), archive_path))
+        self.assertTrue(zipfile.is_zipfile(archive_path))
+
+    def test_store_only_adds_new_blobs(self):
+        store = ObjectStore(os.path.join(self.root, "store"))
+        manifest_path = os.path.join(self.root, "store", "manifests", "docs.json")
+        self.fill(StoreOutput(self.out, store, manifest_path))
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        digest = manifest["files"]["index.html"]
+        self.assertEqual(manifest["files"]["blog/index.html"], digest)
+        self.assertEqual(len(manifest["new"]), 4)
+        with open(store.blob_path(digest)) as f:
+            self.assertEqual(f.read(), "<p>hi</p>")
+
+        store = ObjectStore(os.path.join(self.root, "store"))
+        output = StoreOutput(self.out, store, manifest_path)
+        output.write(os.path.join(self.out, "index.html"), "<p>hi</p>")
+        output.write(os.path.join(self.out, "new.html"), "<p>new</p>")
+        output.close()
+        self.assertEqual(store.reused, 1)
+        with open(manifest_path) as f:
+            self.assertEqual(json.load(f)["new"], [output.files["new.html"]])
+
+if __name__ == "__main__":
+    unittest.main()
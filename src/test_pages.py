@@ -0,0 +1,64 @@
+import unittest
+
+from pages import PageRecord
+from transformers import parse_page
+
+class TestParsePage(unittest.TestCase):
+    def test_metadata(self):
+        md = """
+Intro with **bold** words.
+
+# The _Real_ Title
+
+![first](/images/a.png) and ![second](/images/b.png)
+
+- three word item
+"""
+        root, state = parse_page(md)
+        self.assertEqual(root.tag, "div")
+        self.assertEqual(state.title, "The Real Title")
+        self.assertEqual(state.description, "Intro with bold words.")
+        self.assertEqual(state.first_image, "/images/a.png")
+        self.assertEqual(state.word_count, 4 + 3 + 3 + 3)
+
+    def test_first_h1_wins(self):
+        _, state = parse_page("## Sub\n\n# One\n\n# Two")
+        self.assertEqual(state.title, "One")
+
+    def test_links_rewritten_for_base_path(self):
+        md = "# T\n\n[home](/) [ext](https://x.org) [cdn](//cdn/x) ![img](/a.png) `href=\"/x\"`"
+        root, state = parse_page(md, base_path="/site/")
+        html = root.to_html()
+        self.assertIn('href="/site/"', html)
+        self.assertIn('href="https://x.org"', html)
+        self.assertIn('href="//cdn/x"', html)
+        self.assertIn('src="/site/a.png"', html)
+        self.assertIn('<code>href="/x"</code>', html)
+        self.assertEqual(len(state.links), 2)
+        self.assertEqual(state.first_image, "/a.png")
+
+    def test_apply_base_path(self):
+        root, state = parse_page("# T\n\n[**home**](/about)", base_path="/a/")
+        state.apply_base_path("/b/")
+        self.assertIn('href="/b/about"', root.to_html())
+        state.apply_base_path("/")
+        self.assertIn('href="/about"', root.to_html())
+
+    def test_no_title(self):
+        _, state = parse_page("just text\n\n## not a title")
+        self.assertIsNone(state.title)
+
+    def test_image_in_list(self):
+        _, state = parse_page("# T\n\n- ![pic](/x.png)")
+        self.assertEqual(state.first_image, "/x.png")
+
+    def test_to_record(self):
+        _, state = parse_page("# Title\n\nFirst paragraph.")
+        record = state.to_record("content/index.md", "docs/index.html", "/", 1.0)
+        self.assertEqual(
+            record,
+            PageRecord("content/index.md", "docs/index.html", "/", 1.0, "Title", "First paragraph.", 3, None),
+        )
+
+if __name__ == "__main__":
+    unittest.main()
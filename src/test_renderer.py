@@ -0,0 +1,60 @@
+import random, unittest
+
+from errors import LimitError, MarkdownError
+from renderer import RenderOptions, render, render_tree
+
+ALPHABET = ["_", "*", "**", "`", "```", "```python\n", "[", "]", "(", ")", "![", ">", "- ", "1. ", "# ", " ", "\n", "\n\n", "a", "b c", "/", "\\", "\t", "\r\n"]
+
+def depth(node):
+    if not node.children:
+        return 1
+    return 1 + max(depth(child) for child in node.children)
+
+class TestRender(unittest.TestCase):
+    def test_render(self):
+        self.assertEqual(render("# Hi\n\nsome **bold**"), '<div><h1 id="hi">Hi</h1><p>some <b>bold</b></p></div>')
+        self.assertEqual(render(""), "<div></div>")
+
+    def test_options(self):
+        options = RenderOptions(base_path="/docs/", minify=True)
+        self.assertEqual(render("[home](/)  x", options), "<div><p><a href=/docs/>home</a> x</p></div>")
+
+    def test_input_size_limit(self):
+        with self.assertRaises(LimitError) as context:
+            render("a" * 11, RenderOptions(max_input_size=10))
+        self.assertIsInstance(context.exception, MarkdownError)
+        self.assertEqual(render("a" * 10, RenderOptions(max_input_size=10)), "<div><p>aaaaaaaaaa</p></div>")
+
+    def test_block_nesting_limit(self):
+        root, _ = render_tree(">" * 5000 + " x", RenderOptions(max_nesting=8))
+        self.assertLessEqual(depth(root), 8 + 3)
+        self.assertIn(">>>", root.to_html())
+
+        items = "\n".join("  " * i + "- x" for i in range(500))
+        root, _ = render_tree(items, RenderOptions(max_nesting=8))
+        self.assertLessEqual(depth(root), 8 + 3)
+
+    def test_inline_nesting_limit(self):
+        markdown = "**a _a " * 500 + "x" + " a_ a**" * 500
+        self.assertGreater(depth(render_tree(markdown)[0]), 2 + 8 + 1)
+        for text in (markdown, f"[{markdown}](/x)"):
+            root, _ = render_tree(text, RenderOptions(max_nesting=8))
+            self.assertLessEqual(depth(root), 2 + 8 + 1)
+
+    def test_empty_spans(self):
+        self.assertEqual(render("``"), "<div><p></p></div>")
+        self.assertEqual(render("____"), "<div><p>____</p></div>")
+        self.assertEqual(render("```python\n```"), '<div><pre><code class="language-python"></code></pre></div>')
+
+    def test_fuzz(self):
+        rng = random.Random(42)
+        for _ in range(2000):
+            markdown = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 80)))
+            try:
+                html = render(markdown, RenderOptions(max_nesting=6))
+            except Exception as e:
+                self.fail(f"render({markdown!r}) raised {e!r}")
+            self.assertTrue(html.startswith("<div>"))
+
+if __name__ == "__main__":
+    unittest.main()
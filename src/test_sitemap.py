@@ -0,0 +1,82 @@
+import os, tempfile, unittest
+
+from pages import PageRecord
+from sitemap import SitemapWriter, FeedWriter
+
+def make_record(url, mtime, title=None, description=None):
+    return PageRecord(f"content{url}index.md", f"docs{url}index.html", url, mtime, title, description)
+
+class TestSitemap(unittest.TestCase):
+    def test_single_part(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            writer = SitemapWriter(out_dir, "https://example.com", "/")
+            writer.add(make_record("/", 0))
+            writer.add(make_record("/blog/tom/", 0))
+            self.assertEqual(writer.close(), ["sitemap-1.xml"])
+
+            with open(os.path.join(out_dir, "sitemap-1.xml")) as f:
+                part = f.read()
+            self.assertIn("<loc>https://example.com/blog/tom/</loc>", part)
+            self.assertIn("<lastmod>1970-01-01T00:00:00Z</lastmod>", part)
+            self.assertTrue(part.endswith("</urlset>\n"))
+
+            with open(os.path.join(out_dir, "sitemap.xml")) as f:
+                index = f.read()
+            self.assertIn("<loc>https://example.com/sitemap-1.xml</loc>", index)
+
+    def test_split_parts(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            writer = SitemapWriter(out_dir, "https://example.com/", "/site/", max_urls=2)
+            for i in range(5):
+                writer.add(make_record(f"/site/page{i}/", i))
+            self.assertEqual(writer.close(), ["sitemap-1.xml", "sitemap-2.xml", "sitemap-3.xml"])
+
+            with open(os.path.join(out_dir, "sitemap-3.xml")) as f:
+                self.assertEqual(f.read().count("<url>"), 1)
+            with open(os.path.join(out_dir, "sitemap.xml")) as f:
+                self.assertIn("<loc>https://example.com/site/sitemap-2.xml</loc>", f.read())
+
+    def test_escapes_urls(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            writer = SitemapWriter(out_dir, "https://example.com")
+            writer.add(make_record("/a&b/", 0))
+            writer.close()
+            with open(os.path.join(out_dir, "sitemap-1.xml")) as f:
+                self.assertIn("/a&amp;b/", f.read())
+
+class TestFeed(unittest.TestCase):
+    def test_newest_bounded(self):
+        feed = FeedWriter("unused.xml", "https://example.com", "Feed", "/blog/", limit=3)
+        for i in [5, 1, 9, 3, 7, 2]:
+            feed.add(make_record(f"/blog/post{i}/", i, f"Post {i}"))
+        self.assertEqual(len(feed.heap), 3)
+        self.assertEqual([r.mtime for r in feed.newest()], [9, 7, 5])
+
+    def test_prefix_filter(self):
+        feed = FeedWriter("unused.xml", "https://example.com", "Feed", "/blog/")
+        feed.add(make_record("/", 1))
+        feed.add(make_record("/blog/", 1))
+        feed.add(make_record("/contact/", 1))
+        feed.add(make_record("/blog/tom/", 1, "Tom"))
+        self.assertEqual([r.url for r in feed.newest()], ["/blog/tom/"])
+
+    def test_rss_and_atom(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            for feed_format, marker in [("rss", "<item>"), ("atom", "<entry>")]:
+                path = os.path.join(out_dir, f"{feed_format}.xml")
+                feed = FeedWriter(path, "https://example.com", "Feed", "/blog/", feed_format=feed_format)
+                feed.add(make_record("/blog/tom/", 1, "Tom & Co", "A <merry> fellow"))
+                feed.close()
+                with open(path) as f:
+                    text = f.read()
+                self.assertIn(marker, text)
+                self.assertIn("A &lt;merry&gt; fellow", text)
+                self.assertIn("Tom &amp; Co", text)
+                self.assertIn("https://example.com/blog/tom/", text)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            FeedWriter("unused.xml", "https://example.com", "Feed", feed_format="json")
+
+if __name__ == "__main__":
+    unittest.main()
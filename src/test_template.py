@@ -0,0 +1,92 @@
+import os, tempfile, unittest
+
+from errors import TemplateError
+from template import Template, TemplateLoader
+
+class TestTemplate(unittest.TestCase):
+    def test_variables(self):
+        template = Template("<title>{{ Title }}</title>{{ Content }}{{ missing }}")
+        self.assertEqual(template.render({"Title": "Hi", "Content": "<p>x</p>"}), "<title>Hi</title><p>x</p>")
+
+    def test_dotted_lookup(self):
+        template = Template("{{ page.author.name }} {{ site.title }}")
+        context = {"page": {"author": {"name": "Tom"}}, "site": {"title": "Club"}}
+        self.assertEqual(template.render(context), "Tom Club")
+
+    def test_for_loop(self):
+        template = Template("<ul>{% for tag in page.tags %}<li>{{ tag }}</li>{% endfor %}</ul>{{ tag }}")
+        self.assertEqual(template.render({"page": {"tags": ["a", "b"]}}), "<ul><li>a</li><li>b</li></ul>")
+        self.assertEqual(template.render({"page": {}}), "<ul></ul>")
+
+    def test_nested_loop(self):
+        template = Template("{% for h in headings %}{% for c in h.children %}{{ h.id }}{{ c }};{% endfor %}{% endfor %}")
+        context = {"headings": [{"id": "a", "children": [1, 2]}, {"id": "b", "children": [3]}]}
+        self.assertEqual(template.render(context), "a1;a2;b3;")
+
+    def test_if_else(self):
+        template = Template("{% if TOC %}<nav>{{ TOC }}</nav>{% else %}none{% endif %}{% if not draft %}!{% endif %}")
+        self.assertEqual(template.render({"TOC": "toc"}), "<nav>toc</nav>!")
+        self.assertEqual(template.render({"TOC": "", "draft": True}), "none")
+
+    def test_compiled_segments(self):
+        template = Template("a{{ b }}c")
+        self.assertEqual(template.segments[0], "a")
+        self.assertEqual(template.segments[2], "c")
+
+    def test_base_path(self):
+        template = Template('<link href="/a.css"><a href="//cdn/x">{% if x %}<img src="/i.png">{% endif %}</a>{{ Content }}')
+        context = {"x": True, "Content": '<code>href="/x"</code>'}
+        self.assertEqual(
+            template.render(context, base_path="/site/"),
+            '<link href="/site/a.css"><a href="//cdn/x"><img src="/site/i.png"></a><code>href="/x"</code>',
+        )
+        self.assertEqual(template.render(context), '<link href="/a.css"><a href="//cdn/x"><img src="/i.png"></a><code>href="/x"</code>')
+        self.assertIn(("/site/", False), template.variants)
+
+    def test_errors(self):
+        for source in ("{% for x %}", "{% endif %}", "{% if a %}", "{% bogus %}", "{{ a b }}", "{% else %}"):
+            with self.assertRaises(TemplateError):
+                Template(source, "t.html")
+        with self.assertRaises(TemplateError) as context:
+            Template("line\n{% endfor %}", "t.html")
+        self.assertEqual(str(context.exception), "t.html:2: Unexpected 'endfor'")
+
+class TestTemplateLoader(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.write("partials/header.html", "<h1>{{ site.title }}</h1>")
+        self.write("page.html", '{% include "partials/header.html" %}{{ Content }}')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_include(self):
+        loader = TemplateLoader(self.root)
+        template = loader.load(os.path.join(self.root, "page.html"))
+        html = template.render({"site": {"title": "Club"}, "Content": "body"}, loader)
+        self.assertEqual(html, "<h1>Club</h1>body")
+
+    def test_cached_by_hash(self):
+        loader = TemplateLoader(self.root)
+        path = os.path.join(self.root, "page.html")
+        first = loader.load(path)
+        self.assertIs(loader.load(path), first)
+        os.utime(path, ns=(0, 0))
+        self.assertIs(loader.load(path), first)
+        self.assertEqual(loader.compiles, 1)
+
+        self.write("page.html", "changed")
+        os.utime(path, ns=(1, 1))
+        self.assertEqual(loader.load(path).render({}), "changed")
+        self.assertEqual(loader.compiles, 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from pages import ParseState
+from toc import HeadingIndex, slugify
+from transformers import block_to_heading, markdown_to_html_node
+
+class TestToc(unittest.TestCase):
+    def test_slugify(self):
+        self.assertEqual(slugify("Why Tom Bombadil Was a Mistake"), "why-tom-bombadil-was-a-mistake")
+        self.assertEqual(slugify("  The \"Lord\" of the Rings! "), "the-lord-of-the-rings")
+        self.assertEqual(slugify("snake_case -- name"), "snake-case-name")
+        self.assertEqual(slugify("???"), "section")
+
+    def test_dedupe(self):
+        index = HeadingIndex()
+        self.assertEqual(index.add(2, "Intro"), "intro")
+        self.assertEqual(index.add(2, "Intro"), "intro-1")
+        self.assertEqual(index.add(2, "Intro 1"), "intro-1-1")
+        self.assertEqual(index.add(2, "Intro"), "intro-2")
+
+    def test_heading_plain_text_id(self):
+        html = markdown_to_html_node("## A **bold** `move`").to_html()
+        self.assertEqual(html, '<div><h2 id="a-bold-move">A <b>bold</b> <code>move</code></h2></div>')
+
+    def test_heading_without_state(self):
+        self.assertEqual(block_to_heading("# Title").to_html(), "<h1>Title</h1>")
+
+    def test_ids_per_page(self):
+        first = markdown_to_html_node("# Title").to_html()
+        second = markdown_to_html_node("# Title").to_html()
+        self.assertEqual(first, second)
+
+    def test_toc(self):
+        state = ParseState()
+        markdown_to_html_node("# Top\n\n## One\n\n### Deep\n\n## Two\n\ntext", state=state)
+        self.assertEqual(
+            state.toc_node().to_html(),
+            '<nav class="toc"><ul><li><a href="#top">Top</a><ul>'
+            '<li><a href="#one">One</a><ul><li><a href="#deep">Deep</a></li></ul></li>'
+            '<li><a href="#two">Two</a></li></ul></li></ul></nav>',
+        )
+
+    def test_toc_starts_below_h1(self):
+        state = ParseState()
+        markdown_to_html_node("### Deep\n\n## Up", state=state)
+        self.assertEqual(
+            state.toc_node().to_html(),
+            '<nav class="toc"><ul><li><a href="#deep">Deep</a></li><li><a href="#up">Up</a></li></ul></nav>',
+        )
+
+    def test_no_headings(self):
+        state = ParseState()
+        markdown_to_html_node("just text", state=state)
+        self.assertIsNone(state.toc_node())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -582,7 +582,7 @@ the **same** even with inline stuff
         html = node.to_html()
         self.assertEqual(
             html,
-            "<div><h1>this is an h1</h1><h3>this is an h3</h3><h6>this is an h6</h6></div>",
+            "<div><h1 id=\"this-is-an-h1\">this is an h1</h1><h3 id=\"this-is-an-h3\">this is an h3</h3><h6 id=\"this-is-an-h6\">this is an h6</h6></div>",
         )
 
     def test_blockquote(self):
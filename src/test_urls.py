@@ -0,0 +1,19 @@
+import unittest
+
+from urls import rewrite_attributes, rewrite_url
+
+class TestUrls(unittest.TestCase):
+    def test_rewrite_url(self):
+        self.assertEqual(rewrite_url("/a/b.png", "/site/"), "/site/a/b.png")
+        self.assertEqual(rewrite_url("/", "/site/"), "/site/")
+        self.assertEqual(rewrite_url("//cdn/x", "/site/"), "//cdn/x")
+        self.assertEqual(rewrite_url("https://x.org/", "/site/"), "https://x.org/")
+        self.assertEqual(rewrite_url("#top", "/site/"), "#top")
+        self.assertEqual(rewrite_url("/a", "/"), "/a")
+
+    def test_rewrite_attributes(self):
+        html = '<a href="/x">/y</a><img src="/i.png"><a href="//cdn/z">'
+        self.assertEqual(rewrite_attributes(html, "/s/"), '<a href="/s/x">/y</a><img src="/s/i.png"><a href="//cdn/z">')
+
+if __name__ == "__main__":
+    unittest.main()
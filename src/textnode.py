@@ -11,17 +11,21 @@ class TextType(Enum):
     IMAGE = "image"
 
 class TextNode():
-    def __init__(self, text: str, type: TextType, url: str=None):
+    def __init__(self, text: str, type: TextType, url: str=None, children: list=None):
         self.text = text
         self.text_type = type
         self.url = url
+        self.children = children
     
     def __eq__(self, other):
         return (
             self.text == other.text
             and self.text_type == other.text_type
             and self.url == other.url
+            and self.children == other.children
         )
     
     def __repr__(self):
+        if self.children:
+            return f"TextNode({self.text}, {self.text_type.value}, {self.url}, {self.children})"
         return f"TextNode({self.text}, {self.text_type.value}, {self.url})"
\ No newline at end of file
@@ -0,0 +1,55 @@
+import re
+
+from functools import lru_cache
+
+from htmlnode import LeafNode, ParentNode
+
+SLUG_STRIP = re.compile(r"[^\w\s-]")
+SLUG_SEPARATORS = re.compile(r"[\s_-]+")
+
+@lru_cache(maxsize=8192)
+def slugify(text):
+    slug = SLUG_STRIP.sub("", text.lower())
+    slug = SLUG_SEPARATORS.sub("-", slug).strip("-")
+    return slug or "section"
+
+class HeadingIndex():
+    # Collects headings while a page is parsed, handing out ids that are unique
+    # within the page ("intro", "intro-1", ...) and building the TOC from them.
+    def __init__(self):
+        self.headings = []
+        self.used = set()
+        self.counts = {}
+
+    def add(self, level, text):
+        base = slugify(text)
+        slug = base
+        count = self.counts.get(base, 0)
+        while slug in self.used:
+            count += 1
+            slug = f"{base}-{count}"
+        self.counts[base] = count
+        self.used.add(slug)
+        self.headings.append((level, text, slug))
+        return slug
+
+    def to_html_node(self):
+        if not self.headings:
+            return None
+
+        root = []
+        stack = [(0, root)]
+        nested = []
+        for level, text, slug in self.headings:
+            while len(stack) > 1 and stack[-1][0] >= level:
+                stack.pop()
+            item = ParentNode("li", [LeafNode("a", text, {"href": f"#{slug}"})])
+            stack[-1][1].append(item)
+            children = []
+            nested.append((item, children))
+            stack.append((level, children))
+
+        for item, children in nested:
+            if children:
+                item.children.append(ParentNode("ul", children))
+        return ParentNode("nav", [ParentNode("ul", root)], {"class": "toc"})
@@ -1,20 +1,28 @@
-from htmlnode import LeafNode, ParentNode
+import metrics
+
+from time import perf_counter
+
+from htmlnode import HTMLNode, LeafNode, ParentNode
 from textnode import TextNode, TextType
-from blocks import BlockType, block_to_block_type
+from blocks import BlockType, default_block_registry
 from helpers import extract_markdown_images, extract_markdown_links
+from inline import default_inline_parser, plain_text
+from highlight import highlight
+from pages import ParseState
+from blockparser import BlockParser, Container, Leaf, parse_blocks
+from errors import MarkdownError
 
 def markdown_to_blocks(markdown):
-    markdown = markdown.replace("\r\n", "\n")
+    parser = BlockParser()
+    root = parser.parse(markdown)
+    starts = [child.line for child in root.children]
+    starts.append(len(parser.lines))
     blocks = []
-    sections = markdown.split("\n\n")
-    for section in sections:
-        section = section.strip()
-        if section == "":
-            continue
-        blocks.append(section)
+    for i in range(len(root.children)):
+        blocks.append("\n".join(parser.lines[starts[i]:starts[i + 1]]).strip())
     return blocks
 
-def text_node_to_html_node(text_node):
+def text_node_to_html_node(text_node, state=None):
     tag = None
     value = None
     props = None
@@ -34,24 +42,32 @@ def text_node_to_html_node(text_node):
             tag = "a" ######
             value = text_node.text
             props = {"href": text_node.url}
+            if state is not None:
+                state.add_link(props, "href")
         case TextType.IMAGE:
             tag = "img"
             value = ""
             props = {"src": text_node.url, "alt": text_node.text}
+            if state is not None:
+                state.add_link(props, "src")
         case _:
             raise Exception(f"Unknown TextType: '{text_node.text_type.value}'")
+    if state is not None and tag is not None:
+        state.selectors.add(tag)
         
+    if text_node.children:
+        return ParentNode(tag, textnodes_to_children(text_node.children, state), props)
     node = LeafNode(tag, value, props)
     return node
 
-def text_to_textnodes(text):
-    nodes = [TextNode(text, TextType.TEXT)]
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-    return nodes
+def text_to_textnodes(text, state=None):
+    max_nesting = None if state is None else state.max_nesting
+    if metrics.active is None:
+        return default_inline_parser.parse(text, max_nesting)
+    start = perf_counter()
+    text_nodes = default_inline_parser.parse(text, max_nesting)
+    metrics.active.counter("ssg_inline_parse_seconds_total").inc(perf_counter() - start)
+    return text_nodes
 
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
     new_nodes = []
@@ -112,81 +128,186 @@ def split_nodes_helper(old_nodes, is_image):
         new_nodes.extend(split_nodes)
     return new_nodes
 
-def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
-    nodes = []
-    for block in blocks:
-        block_type =  block_to_block_type(block)
-        
-        match block_type:
-            case BlockType.PARAGRAPH:
-                nodes.append(block_to_paragraph(block))
-            case BlockType.HEADING:
-                nodes.append(block_to_heading(block))
-            case BlockType.CODE:
-                nodes.append(block_to_code(block))
-            case BlockType.QUOTE:
-                nodes.append(block_to_quote(block))
-            case BlockType.UNORDERED_LIST:
-                nodes.append(block_to_unordered_list(block))
-            case BlockType.ORDERED_LIST:
-                nodes.append(block_to_ordered_list(block))
-            case _:
-                raise ValueError("Unknown Block Type")
+def parse_page(markdown, registry=default_block_registry, base_path="/"):
+    state = ParseState(registry, base_path)
+    root_node = markdown_to_html_node(markdown, registry, state)
+    return root_node, state
+
+def markdown_to_html_node(markdown, registry=default_block_registry, state=None):
+    if state is None:
+        state = ParseState(registry)
+    state.registry = registry
+    start = perf_counter() if metrics.active is not None else None
+    nodes = render_blocks(parse_blocks(markdown, state.max_nesting).children, state)
 
     root_node = ParentNode("div", nodes)
+    state.selectors.add("div")
+    if start is not None:
+        metrics.active.counter("ssg_block_parse_seconds_total").inc(perf_counter() - start)
     return root_node
 
-def block_to_paragraph(block):
+def render_blocks(blocks, state):
+    nodes = []
+    state.depth += 1
+    for block in blocks:
+        nodes.append(render_block(block, state))
+    state.depth -= 1
+    return nodes
+
+def render_block(block, state):
+    try:
+        if isinstance(block, Container):
+            node = state.registry.render(block, state, container_block_type(block))
+        elif block.kind == "paragraph" and state.depth > state.max_nesting:
+            node = state.registry.render(block.text(), state, BlockType.PARAGRAPH)
+        else:
+            node = state.registry.render(block.text(), state)
+    except MarkdownError:
+        raise
+    except Exception as e:
+        raise MarkdownError(str(e), block.line + 1) from e
+    state.note_node(node)
+    return node
+
+def container_block_type(container):
+    if container.kind == "quote":
+        return BlockType.QUOTE
+    if container.ordered:
+        return BlockType.ORDERED_LIST
+    return BlockType.UNORDERED_LIST
+
+def paragraph_text(block, state):
+    if not isinstance(block, Leaf) or block.kind != "paragraph":
+        return None
+    text = block.text()
+    if state.registry.block_type(text) != BlockType.PARAGRAPH:
+        return None
+    return text.replace("\n", " ")
+
+def block_to_paragraph(block, state=None):
     block = block.replace("\n", " ")
-    children = text_to_children(block)
-    return ParentNode("p", children)
+    text_nodes = text_to_textnodes(block, state)
+    if state is not None:
+        note_text(state, block, text_nodes)
+        if state.description is None:
+            state.description = plain_text(text_nodes).strip() or None
+    return ParentNode("p", textnodes_to_children(text_nodes, state))
 
-def block_to_heading(block):
+def block_to_heading(block, state=None):
     heading_size = block.find(" ")
-    children = text_to_children(block[heading_size+1:])
-    return ParentNode(f"h{heading_size}", children)
+    text_nodes = text_to_textnodes(block[heading_size+1:], state)
+    children = textnodes_to_children(text_nodes, state)
+    if state is None:
+        return ParentNode(f"h{heading_size}", children)
 
-def block_to_code(block):
-    block = block.removeprefix("```\n")
+    note_text(state, block[heading_size+1:], text_nodes)
+    heading_text = plain_text(text_nodes)
+    if heading_size == 1 and state.title is None:
+        state.title = heading_text
+    slug = state.headings.add(heading_size, heading_text)
+    return ParentNode(f"h{heading_size}", children, {"id": slug})
+
+def block_to_code(block, state=None):
+    info_end = block.find("\n")
+    info = block[3:info_end].split()
+    block = block[info_end + 1:]
     block = block.removesuffix("```")
-    text_node = TextNode(block, TextType.TEXT)
-    code_node = ParentNode("code", [text_node_to_html_node(text_node)])
+    if not info:
+        text_node = TextNode(block, TextType.TEXT)
+        code_node = ParentNode("code", [text_node_to_html_node(text_node)])
+        if state is not None:
+            state.selectors.add("code")
+        return ParentNode("pre", [code_node])
+
+    language = info[0]
+    used = None
+    if state is not None:
+        used = state.selectors
+        used.update(("code", f".language-{language}"))
+    children = highlight(block, language, used)
+    if not children:
+        children = [text_node_to_html_node(TextNode(block, TextType.TEXT))]
+    code_node = ParentNode("code", children, {"class": f"language-{language}"})
     parent_node = ParentNode("pre", [code_node])
     return parent_node
 
-def block_to_quote(block):
-    lines = block.split("\n")
-    new_lines = []
-    for line in lines:
-        new_lines.append(line.removeprefix("> "))
-    children = text_to_children(" ".join(new_lines))
-    return ParentNode("blockquote", children)
+def block_to_quote(block, state=None):
+    if state is None:
+        state = ParseState()
+    if isinstance(block, str):
+        block = parse_blocks(block).children[0]
+    if not block.children:
+        return LeafNode("blockquote", "")
+
+    if len(block.children) == 1:
+        text = paragraph_text(block.children[0], state)
+        if text is not None:
+            return ParentNode("blockquote", text_to_children(text, state))
+    return ParentNode("blockquote", render_blocks(block.children, state))
+
+def block_to_unordered_list(block, state=None):
+    return list_to_html_node("ul", block, state)
+
+def block_to_ordered_list(block, state=None):
+    return list_to_html_node("ol", block, state)
+
+def list_to_html_node(tag, block, state):
+    if state is None:
+        state = ParseState()
+    if isinstance(block, str):
+        block = parse_blocks(block).children[0]
 
-def block_to_unordered_list(block):
-    lines = block.split("\n")
-    children = []
-    for line in lines:
-        ele_children = text_to_children(line[2:])
-        ele_node = ParentNode("li", ele_children)
-        children.append(ele_node)
-    return ParentNode("ul", children)
-
-def block_to_ordered_list(block):
-    lines = block.split("\n")
     children = []
-    for line in lines:
-        remove_size = line.find(" ") + 1
-        ele_children = text_to_children(line[remove_size:])
-        ele_node = ParentNode("li", ele_children)
-        children.append(ele_node)
-    return ParentNode("ol", children)
-
-def text_to_children(block):
-    children_nodes = []
-    text_nodes = text_to_textnodes(block)
+    for item in block.children:
+        ele_children = []
+        for child in item.children:
+            text = None if block.loose else paragraph_text(child, state)
+            if text is None:
+                ele_children.append(render_block(child, state))
+            else:
+                ele_children.extend(text_to_children(text, state))
+        if ele_children:
+            children.append(ParentNode("li", ele_children))
+        else:
+            children.append(LeafNode("li", ""))
+    if children:
+        state.selectors.add("li")
 
+    props = None
+    if block.ordered and block.start != 1:
+        props = {"start": str(block.start)}
+    return ParentNode(tag, children, props)
+
+def text_to_children(block, state=None):
+    text_nodes = text_to_textnodes(block, state)
+    if state is not None:
+        note_text(state, block, text_nodes)
+    return textnodes_to_children(text_nodes, state)
+
+def note_text(state, text, text_nodes):
+    state.word_count += len(text.split())
+    if state.first_image is not None:
+        return
+    for node in text_nodes:
+        if isinstance(node, TextNode) and node.text_type == TextType.IMAGE:
+            state.first_image = node.url
+            return
+
+def textnodes_to_children(text_nodes, state=None):
+    children_nodes = []
     for node in text_nodes:
-        children_nodes.append(text_node_to_html_node(node))
+        if isinstance(node, HTMLNode):
+            children_nodes.append(node)
+            continue
+        children_nodes.append(text_node_to_html_node(node, state))
+    if not children_nodes:
+        children_nodes.append(LeafNode(None, ""))
     
-    return children_nodes
\ No newline at end of file
+    return children_nodes
+
+default_block_registry.register_renderer(BlockType.PARAGRAPH, block_to_paragraph)
+default_block_registry.register_renderer(BlockType.HEADING, block_to_heading)
+default_block_registry.register_renderer(BlockType.CODE, block_to_code)
+default_block_registry.register_renderer(BlockType.QUOTE, block_to_quote)
+default_block_registry.register_renderer(BlockType.UNORDERED_LIST, block_to_unordered_list)
+default_block_registry.register_renderer(BlockType.ORDERED_LIST, block_to_ordered_list)
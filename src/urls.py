@@ -0,0 +1,16 @@
+import re
+
+ATTRIBUTE_PATTERN = re.compile(r"((?:href|src)=\")/(?!/)")
+
+def is_root_relative(url):
+    return url.startswith("/") and not url.startswith("//")
+
+def rewrite_url(url, base_path):
+    if base_path == "/" or not is_root_relative(url):
+        return url
+    return base_path + url[1:]
+
+def rewrite_attributes(html, base_path):
+    if base_path == "/":
+        return html
+    return ATTRIBUTE_PATTERN.sub(lambda match: match[1] + base_path, html)